@@ -0,0 +1,75 @@
+"""
+Document Spool Module
+
+This module spools documents to a temporary file, so documents that do not
+fit in memory can be read several times in batches.
+"""
+import json
+import tempfile
+from typing import Iterator, List
+
+from dataQuest.settings import ENCODING
+
+
+class DocumentSpool:
+    """
+    Documents stored in a temporary file, in the order they are added.
+
+    All documents are added before they are read. The file is removed when
+    the spool is closed.
+    """
+
+    def __init__(self) -> None:
+        # pylint: disable=consider-using-with
+        self._file = tempfile.TemporaryFile("w+", encoding=ENCODING)
+        self._count = 0
+
+    def __enter__(self) -> "DocumentSpool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, document: str) -> None:
+        """
+        Add a document to the end of the spool.
+
+        Args:
+            document (str): The document.
+        """
+        self._file.write(json.dumps(document, ensure_ascii=False))
+        self._file.write("\n")
+        self._count += 1
+
+    def iter_batches(self, batch_chars: int) -> Iterator[List[str]]:
+        """
+        Read the documents in batches.
+
+        Args:
+            batch_chars (int): The maximum number of characters of the
+            documents of a batch. A longer document forms a batch by itself.
+
+        Yields:
+            List[str]: The next documents, in the order they were added.
+        """
+        self._file.flush()
+        self._file.seek(0)
+        batch: List[str] = []
+        chars = 0
+        for line in self._file:
+            document = json.loads(line)
+            if batch and chars + len(document) > batch_chars:
+                yield batch
+                batch = []
+                chars = 0
+            batch.append(document)
+            chars += len(document)
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """Close and remove the file of the spool."""
+        self._file.close()
@@ -0,0 +1,231 @@
+"""
+IDF Model Module
+
+This module fits an embedder once on the articles of all periods, or on a
+sample of them, and saves its vocabulary and IDF, so that selection runs
+load the embedder and only transform articles. Scores of different periods
+are then computed with the same IDF.
+"""
+import gzip
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from dataQuest.article_final_selection.document_spool import DocumentSpool
+from dataQuest.article_final_selection.process_article import clean_many
+from dataQuest.article_final_selection.process_articles import (
+    create_embedder, iter_clean_bodies)
+from dataQuest.filter.checkpoint import config_fingerprint
+from dataQuest.models.base import BaseEmbedder
+from dataQuest.settings import ENCODING, TFIDF_MEMORY_BUDGET
+from dataQuest.utils import get_keywords_from_config
+
+IDF_MODEL_VERSION = 1
+VERSION_FIELD = "version"
+EMBEDDER_FIELD = "embedder"
+SPACY_MODEL_FIELD = "spacy_model"
+SPACY_MODEL_VERSION_FIELD = "spacy_model_version"
+CONFIG_HASH_FIELD = "config_hash"
+STATE_FIELD = "state"
+SAMPLE_SEED = 0
+
+
+def idf_model_fingerprint(config_path: Path,
+                          embedder_config: Optional[Dict[str, Any]] = None,
+                          sample_size: Optional[int] = None) -> str:
+    """
+    Compute a fingerprint of the configuration an IDF model is fitted with.
+
+    Args:
+        config_path (Path): Path to the configuration file, whose filters
+        select the articles.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder.
+        sample_size (Optional[int]): The number of sampled articles, or None
+        if the model is fitted on all articles.
+
+    Returns:
+        str: The fingerprint.
+    """
+    return config_fingerprint(config_path,
+                              json.dumps(embedder_config or {},
+                                         sort_keys=True),
+                              str(sample_size))
+
+
+def spacy_model_info(model: BaseEmbedder) -> Tuple[Optional[str],
+                                                   Optional[str]]:
+    """
+    Get the name and version of the SpaCy model of an embedder.
+
+    Args:
+        model (BaseEmbedder): The embedder.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The name, e.g.
+        'nl_core_news_sm', and version of the model, or None if the
+        embedder has no SpaCy model.
+    """
+    nlp = getattr(model, "nlp", None)
+    if nlp is None:
+        return None, None
+    return f"{nlp.meta['lang']}_{nlp.meta['name']}", nlp.meta.get("version")
+
+
+def save_idf_model(model: BaseEmbedder, model_path: Path,
+                   embedder_config: Optional[Dict[str, Any]],
+                   config_hash: str) -> None:
+    """
+    Save the vocabulary and IDF of a fitted embedder.
+
+    Args:
+        model (BaseEmbedder): The fitted embedder.
+        model_path (Path): The path of the '.json.gz' model file.
+        embedder_config (Optional[Dict[str, Any]]): The configuration the
+        embedder was created with.
+        config_hash (str): The fingerprint of the configuration, see
+        idf_model_fingerprint.
+    """
+    spacy_model, spacy_model_version = spacy_model_info(model)
+    artifact = {
+        VERSION_FIELD: IDF_MODEL_VERSION,
+        EMBEDDER_FIELD: embedder_config or {},
+        SPACY_MODEL_FIELD: spacy_model,
+        SPACY_MODEL_VERSION_FIELD: spacy_model_version,
+        CONFIG_HASH_FIELD: config_hash,
+        STATE_FIELD: model.get_idf_state(),
+    }
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = model_path.with_name(model_path.name + ".tmp")
+    with gzip.open(temporary_path, "wt", encoding=ENCODING) as f:
+        json.dump(artifact, f, ensure_ascii=False)
+    os.replace(temporary_path, model_path)
+
+
+def load_idf_model(model_path: Path, config_hash: str) -> BaseEmbedder:
+    """
+    Load an embedder saved by save_idf_model.
+
+    Args:
+        model_path (Path): The path of the '.json.gz' model file.
+        config_hash (str): The fingerprint of the current configuration,
+        see idf_model_fingerprint.
+
+    Returns:
+        BaseEmbedder: The fitted embedder.
+
+    Raises:
+        ValueError: If the model was fitted with another configuration or
+        SpaCy model.
+    """
+    with gzip.open(model_path, "rt", encoding=ENCODING) as f:
+        artifact = json.load(f)
+    if artifact.get(VERSION_FIELD) != IDF_MODEL_VERSION or \
+            artifact.get(CONFIG_HASH_FIELD) != config_hash:
+        raise ValueError(f"The IDF model '{model_path}' was fitted with "
+                         "another configuration; remove it to fit it again")
+
+    model = create_embedder(artifact[EMBEDDER_FIELD])
+    spacy_model, spacy_model_version = spacy_model_info(model)
+    if artifact[SPACY_MODEL_FIELD] != spacy_model:
+        raise ValueError(f"The IDF model '{model_path}' was fitted with "
+                         f"SpaCy model {artifact[SPACY_MODEL_FIELD]}, not "
+                         f"{spacy_model}")
+    if artifact[SPACY_MODEL_VERSION_FIELD] != spacy_model_version:
+        logging.warning("The IDF model %s was fitted with version %s of "
+                        "SpaCy model %s, not version %s", model_path,
+                        artifact[SPACY_MODEL_VERSION_FIELD], spacy_model,
+                        spacy_model_version)
+    model.set_idf_state(artifact[STATE_FIELD])
+    return model
+
+
+def fit_idf_model(input_dir: Path, glob_pattern: str, config_path: Path,
+                  model_path: Path,
+                  embedder_config: Optional[Dict[str, Any]] = None,
+                  sample_size: Optional[int] = None,
+                  memory_budget: int = TFIDF_MEMORY_BUDGET) -> BaseEmbedder:
+    """
+    Fit an embedder on the articles of all periods and save it.
+
+    The embedder is fitted on the cleaned bodies of the articles without a
+    keyword in their title, like the embedder fitted on a single period
+    by apply_tfidf_similarity. The bodies are spooled to a temporary file
+    and fitted in batches within the memory budget, if one is set.
+
+    Args:
+        input_dir (Path): Directory containing the CSV files of the periods.
+        glob_pattern (str): Glob pattern to find the CSV files.
+        config_path (Path): Path to the configuration file.
+        model_path (Path): The path of the '.json.gz' model file.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder.
+        sample_size (Optional[int]): The number of articles randomly sampled
+        to fit the embedder on. All articles are used if None.
+        memory_budget (int): The approximate memory in bytes used for a
+        batch, or 0 to fit on all bodies at once.
+
+    Returns:
+        BaseEmbedder: The fitted embedder.
+    """
+    clean_keywords = list(clean_many(get_keywords_from_config(config_path)))
+    articles_files = sorted(input_dir.rglob(glob_pattern))
+    if not articles_files:
+        raise ValueError(f"No articles to fit the IDF model on in "
+                         f"'{input_dir}'")
+    articles_df = pd.concat([pd.read_csv(articles_file)
+                             for articles_file in articles_files],
+                            ignore_index=True)
+    if sample_size is not None and sample_size < len(articles_df):
+        articles_df = articles_df.sample(n=sample_size,
+                                         random_state=SAMPLE_SEED)
+
+    model = create_embedder(embedder_config)
+    title_selected: Set[int] = set()
+    with DocumentSpool() as spool:
+        for _, clean_body in iter_clean_bodies(articles_df, clean_keywords,
+                                               title_selected):
+            if clean_body != "":
+                spool.append(clean_body)
+        batch_chars = memory_budget // 4 if memory_budget > 0 \
+            else sys.maxsize
+        model.fit_batches(spool.iter_batches(batch_chars))
+    logging.info("Fitted the IDF model on %d articles", len(spool))
+
+    save_idf_model(model, model_path, embedder_config,
+                   idf_model_fingerprint(config_path, embedder_config,
+                                         sample_size))
+    return model
+
+
+def load_or_fit_idf_model(input_dir: Path, glob_pattern: str,
+                          config_path: Path, model_path: Path,
+                          embedder_config: Optional[Dict[str, Any]] = None,
+                          sample_size: Optional[int] = None) -> BaseEmbedder:
+    """
+    Load the IDF model, or fit and save it if it does not exist yet.
+
+    Args:
+        input_dir (Path): Directory containing the CSV files of the periods.
+        glob_pattern (str): Glob pattern to find the CSV files.
+        config_path (Path): Path to the configuration file.
+        model_path (Path): The path of the '.json.gz' model file.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder.
+        sample_size (Optional[int]): The number of articles randomly sampled
+        to fit the embedder on. All articles are used if None.
+
+    Returns:
+        BaseEmbedder: The fitted embedder.
+    """
+    if model_path.exists():
+        return load_idf_model(
+            model_path,
+            idf_model_fingerprint(config_path, embedder_config, sample_size))
+    return fit_idf_model(input_dir, glob_pattern, config_path, model_path,
+                         embedder_config, sample_size)
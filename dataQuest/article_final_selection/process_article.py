@@ -2,7 +2,9 @@
 import gzip
 import json
 import logging
-from typing import List, Union, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Tuple
+from dataQuest.filter.block_gzip import (read_indexed_article,
+                                         read_indexed_metadata)
 from dataQuest.preprocessor.text_cleaner import TextCleaner
 
 text_cleaner = TextCleaner()
@@ -20,6 +22,77 @@ def clean(text:  Union[str, List[str]]) -> str:
     """
     return text_cleaner.preprocess(text)
 
+
+def clean_many(texts: Iterable[Union[str, List[str]]]) -> Iterator[str]:
+    """
+    Clean a stream of texts using TextCleaner, in batches.
+
+    Args:
+        texts (Iterable[Union[str, List[str]]]): The input texts to clean.
+
+    Returns:
+        Iterator[str]: The cleaned texts, in the order of the input.
+    """
+    return text_cleaner.preprocess_many(texts)
+
+
+ArticleContent = Tuple[Union[str, None], Union[List[str], None],
+                       Union[str, None]]
+
+
+def _read_whole_file(gzip_file_path: str) -> Tuple[Dict, Dict]:
+    """Read the metadata and articles of a gzip file as a whole."""
+    with gzip.open(gzip_file_path, 'rt') as f:
+        data = json.load(f)
+    return data.get('newsletter_metadata', {}), data.get('articles', {})
+
+
+def read_articles_from_gzip(gzip_file_path: str,
+                            article_ids: Iterable[Union[str, int]]) -> (
+        Dict)[str, ArticleContent]:
+    """
+    Read several articles from a gzip file at once.
+
+    The file is decompressed and parsed only once, or, if it has a block
+    index, only the requested articles are decompressed.
+
+    Args:
+        gzip_file_path (str): The path to the gzip file.
+        article_ids (Iterable[Union[str, int]]): The IDs of the articles.
+
+    Returns:
+        Dict[str, ArticleContent]: The title, body and date of every
+        article, keyed by the article ID as a string. Articles that cannot
+        be read map to (None, None, None).
+    """
+    ids = [str(article_id) for article_id in article_ids]
+    metadata: Optional[Dict] = None
+    try:
+        metadata = read_indexed_metadata(gzip_file_path)
+        if metadata is not None:
+            articles = {article_id: read_indexed_article(gzip_file_path,
+                                                         article_id) or {}
+                        for article_id in ids}
+    except Exception as e:  # pylint: disable=broad-except
+        logging.warning("Error reading articles through the index of %s, "
+                        "reading the whole file: %s", gzip_file_path, e)
+        metadata = None
+    if metadata is None:
+        try:
+            metadata, articles = _read_whole_file(gzip_file_path)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.error("Error reading articles from %s: %s",
+                          gzip_file_path, e)
+            return {article_id: (None, None, None) for article_id in ids}
+
+    date = metadata.get('date', {})
+    contents: Dict[str, ArticleContent] = {}
+    for article_id in ids:
+        article = articles.get(article_id, {})
+        contents[article_id] = (article.get('title', {}),
+                                article.get('body', {}), date)
+    return contents
+
 # pylint: disable=too-few-public-methods
 
 
@@ -33,16 +106,21 @@ class ArticleProcessor:
         determines whether the article contains any keywords of interests in
         the title.
     """
-    def __init__(self, gzip_file_path: str, article_id: int):
+    def __init__(self, gzip_file_path: str, article_id: int,
+                 content: Optional[ArticleContent] = None):
         """
         Initialize ArticleProcessor with the gzip file path and article ID.
 
         Args:
             gzip_file_path (str): The path to the gzip file.
             article_id (int): The ID of the article.
+            content (Optional[ArticleContent]): The title, body and date of
+            the article, if they are already read, e.g. by
+            read_articles_from_gzip.
         """
         self._file_path = gzip_file_path
         self._article_id = article_id
+        self._content = content
         self._title: Union[str, None] = ''
         self._body: Union[str, list, None] = ''
         self.selected: bool = False
@@ -52,20 +130,32 @@ class ArticleProcessor:
         """
         Read article content from a gzip file.
 
+        Files with a block index are read through the index, so only the
+        metadata and the article itself are decompressed.
+
         Returns:
             Tuple[Union[str, None], Union[list, None], Union[str, None]]:
             A tuple containing the title, body, and date of the article.
         """
+        if self._content is not None:
+            return self._content
+        try:
+            indexed_article = read_indexed_article(self._file_path,
+                                                   str(self._article_id))
+            if indexed_article is not None:
+                metadata = read_indexed_metadata(self._file_path) or {}
+                return (indexed_article.get('title', {}),
+                        indexed_article.get('body', {}),
+                        metadata.get('date', {}))
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning("Error reading article %s through the index of "
+                            "%s, reading the whole file: %s",
+                            str(self._article_id), self._file_path, e)
         try:
-            with gzip.open(self._file_path, 'rt') as f:
-                data = json.load(f)
-                metadata = data.get('newsletter_metadata', {})
-                date = metadata.get('date', {})
-                articles = data.get('articles', {})
-                article = articles.get(str(self._article_id), {})
-                title = article.get('title', {})
-                body = article.get('body', {})
-                return title, body, date
+            metadata, articles = _read_whole_file(self._file_path)
+            article = articles.get(str(self._article_id), {})
+            return (article.get('title', {}), article.get('body', {}),
+                    metadata.get('date', {}))
         except Exception as e:  # pylint: disable=broad-except
             logging.error("Error reading article %s from %s: %s",
                           str(self._article_id), self._file_path, e)
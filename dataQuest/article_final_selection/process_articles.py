@@ -2,14 +2,89 @@
 This module contains functions for selecting articles based on keywords
 and similarity scores.
 """
-from typing import List, Tuple, Dict, Union
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
 import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-from dataQuest.models.tfidf import TfidfEmbedder
-from dataQuest.article_final_selection.process_article import ArticleProcessor
-from dataQuest.article_final_selection.process_article import clean
+from dataQuest.models import EMBEDDER_TYPES
+from dataQuest.models.base import BaseEmbedder
+from dataQuest.settings import TFIDF_MEMORY_BUDGET
+from dataQuest.article_final_selection.process_article import (
+    ArticleContent, read_articles_from_gzip)
+from dataQuest.article_final_selection.process_article import clean_many
 from dataQuest.article_final_selection.article_selector import ArticleSelector
+from dataQuest.article_final_selection.document_spool import DocumentSpool
+from dataQuest.article_final_selection.keyword_similarity import (
+    KeywordSimilarity)
+
+
+def iter_article_contents(articles_df: pd.DataFrame) -> (
+        Iterator)[Tuple[int, ArticleContent]]:
+    """
+    Read the articles listed in a DataFrame, grouped by input file.
+
+    Every input file is read once.
+
+    Args:
+        articles_df (pd.DataFrame): A DataFrame with 'file_path' and
+        'article_id' columns.
+
+    Yields:
+        Tuple[int, ArticleContent]: The index of a row and the title, body
+        and date of its article.
+    """
+    for file_path, group in articles_df.groupby('file_path', sort=False,
+                                                dropna=False):
+        contents = read_articles_from_gzip(str(file_path),
+                                           group['article_id'])
+        for index, article_id in group['article_id'].items():
+            yield int(str(index)), contents.get(str(article_id),
+                                                (None, None, None))
+
+
+def iter_clean_bodies(articles_df: pd.DataFrame, clean_keywords: List[str],
+                      title_selected: Set[int]) -> Iterator[Tuple[int, str]]:
+    """
+    Clean the bodies of the articles listed in a DataFrame.
+
+    Articles are read grouped by input file, so every input file is read
+    once. Titles, and then the bodies of articles without a keyword in
+    their title, are cleaned as streams in batches.
+
+    Args:
+        articles_df (pd.DataFrame): A DataFrame with 'file_path' and
+        'article_id' columns.
+        clean_keywords (List[str]): A list of clean keywords.
+        title_selected (Set[int]): The set to which the indices of the rows
+        of articles with a keyword in their title are added.
+
+    Yields:
+        Tuple[int, str]: The index of a row and the cleaned body of its
+        article, for articles without a keyword in their title, in the
+        order they are read.
+    """
+    waiting_for_title: Deque[Tuple[int, Union[str, List[str]]]] = deque()
+    waiting_for_body: Deque[int] = deque()
+
+    def titles() -> Iterator[str]:
+        for index, (title, body, _) in iter_article_contents(articles_df):
+            if title is None or body is None:
+                continue
+            waiting_for_title.append((index, body))
+            yield title
+
+    def bodies() -> Iterator[Union[str, List[str]]]:
+        for clean_title in clean_many(titles()):
+            index, body = waiting_for_title.popleft()
+            if any(keyword in clean_title for keyword in clean_keywords):
+                title_selected.add(index)
+            else:
+                waiting_for_body.append(index)
+                yield body
+
+    for clean_body in clean_many(bodies()):
+        yield waiting_for_body.popleft(), clean_body
 
 
 def process_articles(articles_filepath: str, clean_keywords: List[str]) -> (
@@ -17,6 +92,9 @@ def process_articles(articles_filepath: str, clean_keywords: List[str]) -> (
     """
     Process articles from a CSV file.
 
+    The bodies are cleaned by iter_clean_bodies. The results are in the
+    order of the rows of the CSV file.
+
     Args:
         articles_filepath (str): The path to the CSV file containing articles.
         clean_keywords (List[str]): A list of clean keywords.
@@ -26,43 +104,138 @@ def process_articles(articles_filepath: str, clean_keywords: List[str]) -> (
          bodies and selected indices.
     """
     articles_df = pd.read_csv(articles_filepath)
+    title_selected: Set[int] = set()
+    clean_bodies: Dict[int, str] = dict(
+        iter_clean_bodies(articles_df, clean_keywords, title_selected))
+
     article_bodies: List[str] = []
     selected_indices: List[int] = []
-    for index, row in articles_df.iterrows():
-        article_processor = ArticleProcessor(row['file_path'],
-                                             row['article_id'])
-        processed_article_body = article_processor.process_article(
-                                                   clean_keywords)
-        if article_processor.selected:
-            selected_indices.append(int(str(index)))
-        elif processed_article_body != "":
-            article_bodies.append(processed_article_body)
+    for index in articles_df.index:
+        row_index = int(str(index))
+        if row_index in title_selected:
+            selected_indices.append(row_index)
+        elif clean_bodies.get(row_index, "") != "":
+            article_bodies.append(clean_bodies[row_index])
     return article_bodies, selected_indices
 
 
-def apply_tfidf_similarity(documents: List[str], keywords: List[str]) -> (
-        List)[float]:
+def score_articles_in_batches(
+        articles_filepath: str, clean_keywords: List[str],
+        embedder_config: Optional[Dict[str, Any]] = None,
+        memory_budget: int = TFIDF_MEMORY_BUDGET,
+        model: Optional[BaseEmbedder] = None) -> (
+        Tuple)[List[float], List[int]]:
+    """
+    Process and score articles from a CSV file within a memory budget.
+
+    The cleaned bodies are spooled to a temporary file. The embedder is
+    fitted on batches of the spooled bodies, which are then transformed
+    and scored batch by batch. About a quarter of the budget is used for
+    the text of a batch, the rest for its tokens and embeddings. The
+    results are the same as those of process_articles followed by
+    apply_tfidf_similarity.
+
+    Args:
+        articles_filepath (str): The path to the CSV file containing articles.
+        clean_keywords (List[str]): A list of clean keywords.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder.
+        memory_budget (int): The approximate memory in bytes used for a
+        batch.
+        model (Optional[BaseEmbedder]): A fitted embedder, see
+        apply_tfidf_similarity.
+
+    Returns:
+        Tuple[List[float], List[int]]: The similarity scores of
+        the processed article bodies and the selected indices.
+    """
+    articles_df = pd.read_csv(articles_filepath)
+    title_selected: Set[int] = set()
+    row_indices = array('q')
+    with DocumentSpool() as spool:
+        for index, clean_body in iter_clean_bodies(
+                articles_df, clean_keywords, title_selected):
+            if clean_body != "":
+                spool.append(clean_body)
+                row_indices.append(index)
+
+        selected_indices = [int(str(index)) for index in articles_df.index
+                            if int(str(index)) in title_selected]
+        batch_chars = max(memory_budget // 4, 1)
+        if model is None:
+            model = create_embedder(embedder_config)
+            model.fit_batches(spool.iter_batches(batch_chars))
+        if len(spool) == 0:
+            # No body is left to score, e.g. when every article is
+            # selected by its title.
+            return [], selected_indices
+        similarity = KeywordSimilarity.from_model(model, clean_keywords)
+        scores = [similarity.scores(model.transform(batch))
+                  for batch in spool.iter_batches(batch_chars)]
+
+    # Bodies are spooled in the order they are read; sort the scores in
+    # the order of the rows.
+    order = np.argsort(articles_df.index.get_indexer(pd.Index(row_indices)),
+                       kind='stable')
+    return np.concatenate(scores)[order].tolist(), selected_indices
+
+
+def create_embedder(embedder_config: Optional[Dict[str, Any]] = None) -> (
+        BaseEmbedder):
+    """
+    Create the embedder used to compare documents with keywords.
+
+    Args:
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration: its type in EMBEDDER_TYPES, which defaults to
+        'tfidf', and arguments of the embedder class. Documents are
+        l2-normalized and pretokenized unless configured otherwise.
+
+    Returns:
+        BaseEmbedder: The embedder.
+
+    Raises:
+        ValueError: If the embedder type is unknown.
+    """
+    embedder_args = dict(embedder_config or {})
+    embedder_type = embedder_args.pop('type', 'tfidf')
+    if embedder_type not in EMBEDDER_TYPES:
+        raise ValueError(f"Unknown embedder type: {embedder_type}")
+    embedder_args.setdefault('norm', 'l2')
+    embedder_args.setdefault('pretokenized', True)
+    return EMBEDDER_TYPES[embedder_type](**embedder_args)
+
+
+def apply_tfidf_similarity(documents: List[str], keywords: List[str],
+                           embedder_config: Optional[Dict[str, Any]] = None,
+                           model: Optional[BaseEmbedder] = None
+                           ) -> List[float]:
     """
     Apply TF-IDF similarity between documents and keywords.
 
     Args:
-        documents (List[str]): A list of document bodies.
-        keywords (List[str]): A list of keywords.
+        documents (List[str]): A list of document bodies, cleaned by
+        TextCleaner.preprocess.
+        keywords (List[str]): A list of keywords, cleaned by
+        TextCleaner.preprocess.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder. A TfidfEmbedder is used by
+        default.
+        model (Optional[BaseEmbedder]): A fitted embedder, e.g. loaded by
+        load_idf_model, which only transforms the documents. If None, an
+        embedder is created and fitted on the documents.
 
     Returns:
         List[float]: A list of similarity scores.
     """
-    model = TfidfEmbedder(ngram_max=1, norm="l2", sublinear_tf=False, min_df=1,
-                          max_df=1.0)
-    keywords_list = [" ".join(keywords)]
-    model.fit(documents)
-    embeddings_documents = model.transform(documents).tocsr()
-    embeddings_keywords = model.transform(keywords_list).tocsr()
-    avg_keywords_embedding = embeddings_keywords.mean(axis=0)
-    avg_keywords_embedding = np.asarray(avg_keywords_embedding).flatten()
-    similarity_scores = cosine_similarity([avg_keywords_embedding],
-                                          embeddings_documents)
-    return similarity_scores[0]
+    if model is None:
+        model = create_embedder(embedder_config)
+        embeddings_documents = model.fit_transform(documents)
+    else:
+        embeddings_documents = model.transform(documents)
+    similarity_scores = KeywordSimilarity.from_model(model, keywords).scores(
+        embeddings_documents)
+    return similarity_scores.tolist()
 
 
 def select_top_articles(similarity_scores: List[float],
@@ -84,7 +257,9 @@ def select_top_articles(similarity_scores: List[float],
 
 
 def select_articles(articles_filepath: str, keywords: List[str],
-                    config: Dict[str, Union[str, float, int]]) -> List[int]:
+                    config: Dict[str, Union[str, float, int]],
+                    embedder_config: Optional[Dict[str, Any]] = None,
+                    model: Optional[BaseEmbedder] = None) -> List[int]:
     """
     Select articles based on keywords, similarity scores, and configuration.
 
@@ -92,14 +267,24 @@ def select_articles(articles_filepath: str, keywords: List[str],
         articles_filepath (str): The path to the CSV file containing articles.
         keywords (List[str]): A list of keywords.
         config (Dict[str, str]): Configuration for selecting articles.
+        embedder_config (Optional[Dict[str, Any]]): The embedder
+        configuration, see create_embedder.
+        model (Optional[BaseEmbedder]): A fitted embedder, see
+        apply_tfidf_similarity.
 
     Returns:
         List[int]: A list of selected article indices.
     """
-    clean_keywords = [clean(keyword) for keyword in keywords]
-    article_bodies, selected_indices = process_articles(articles_filepath,
-                                                        clean_keywords)
-    similarity_scores = apply_tfidf_similarity(article_bodies, clean_keywords)
+    clean_keywords = list(clean_many(keywords))
+    if TFIDF_MEMORY_BUDGET > 0:
+        similarity_scores, selected_indices = score_articles_in_batches(
+            articles_filepath, clean_keywords, embedder_config,
+            model=model)
+    else:
+        article_bodies, selected_indices = process_articles(
+            articles_filepath, clean_keywords)
+        similarity_scores = apply_tfidf_similarity(
+            article_bodies, clean_keywords, embedder_config, model)
     indices = select_top_articles(similarity_scores, config)
     selected_indices.extend(indices)
     return selected_indices
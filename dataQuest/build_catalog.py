@@ -0,0 +1,88 @@
+"""
+This script builds or refreshes the catalog of the metadata of the input
+files of a corpus.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from dataQuest.filter import INPUT_FILE_TYPES
+from dataQuest.filter.catalog import CorpusCatalog
+
+
+def build_catalog(
+    input_dir: Path,
+    glob_pattern: str,
+    input_type: str,
+    catalog_path: Path,
+):
+    """
+    Add new and changed input files to the catalog and remove entries of
+    deleted files.
+
+    Args:
+        input_dir (Path): Directory containing input files.
+        glob_pattern (str): Glob pattern to match input files.
+        input_type (str): File format of the input files.
+        catalog_path (Path): Path of the catalog.
+    """
+    if not input_dir.is_dir():
+        raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
+
+    input_file_class = INPUT_FILE_TYPES[input_type]
+    input_files = (input_file
+                   for path in sorted(input_dir.rglob(glob_pattern))
+                   for input_file in input_file_class.list_files(path))
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    with CorpusCatalog(catalog_path) as catalog:
+        updated, removed = catalog.refresh(input_files)
+    logging.info("Catalog %s: %d entries added or updated, %d removed",
+                 catalog_path, updated, removed)
+
+
+def cli():
+    """
+        Command-line interface for building the catalog.
+    """
+    parser = argparse.ArgumentParser("Build a catalog of input files.")
+
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        help="Base directory for reading input files. ",
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        required=True,
+        help="Glob pattern for find input files; e.g. '*.gz' ",
+    )
+    parser.add_argument(
+        "--input-type",
+        type=str,
+        required=True,
+        choices=list(INPUT_FILE_TYPES.keys()),
+        help="Input file format.",
+    )
+    parser.add_argument(
+        "--catalog-path",
+        type=Path,
+        required=True,
+        help="File path of the catalog.",
+    )
+    args = parser.parse_args()
+
+    try:
+        build_catalog(
+            input_dir=args.input_dir,
+            glob_pattern=args.glob,
+            input_type=args.input_type,
+            catalog_path=args.catalog_path,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,92 @@
+"""
+This script converts issue files to a sharded Parquet store, which can be
+read with the input type 'delpher_kranten_parquet'.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from dataQuest.filter.parquet_store import convert_to_parquet
+
+
+def convert_input_files(
+    input_dir: Path,
+    glob_pattern: str,
+    output_dir: Path,
+    shard_rows: int = 1000000,
+    row_group_rows: int = 10000,
+):
+    """
+    Convert the issue files in a directory to a Parquet store.
+
+    Args:
+        input_dir (Path): Directory containing '.json.gz' issue files.
+        glob_pattern (str): Glob pattern to match input files.
+        output_dir (Path): Directory of the shards of the store.
+        shard_rows (int): Number of articles per shard.
+        row_group_rows (int): Number of articles per row group.
+    """
+    if not input_dir.is_dir():
+        raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
+
+    issues, articles = convert_to_parquet(
+        sorted(input_dir.rglob(glob_pattern)), output_dir, shard_rows,
+        row_group_rows)
+    logging.info("Converted %d issues with %d articles to %s", issues,
+                 articles, output_dir)
+
+
+def cli():
+    """
+        Command-line interface for converting issue files to Parquet.
+    """
+    parser = argparse.ArgumentParser(
+        "Convert issue files to a Parquet store.")
+
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        required=True,
+        help="Base directory for reading input files. ",
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        default="*.json.gz",
+        help="Glob pattern for find input files; e.g. '*.gz' ",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        required=True,
+        help="The directory for storing the shards.",
+    )
+    parser.add_argument(
+        "--shard-rows",
+        type=int,
+        default=1000000,
+        help="Number of articles per shard.",
+    )
+    parser.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=10000,
+        help="Number of articles per row group.",
+    )
+    args = parser.parse_args()
+
+    try:
+        convert_input_files(
+            input_dir=args.input_dir,
+            glob_pattern=args.glob,
+            output_dir=args.output_dir,
+            shard_rows=args.shard_rows,
+            row_group_rows=args.row_group_rows,
+        )
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,7 +1,10 @@
 """define input-file type"""
-from dataQuest.filter.delpher_kranten import KrantenFile
+from dataQuest.filter.delpher_kranten import (KrantenFile, IndexedKrantenFile,
+                                              ParquetKrantenFile)
 
 INPUT_FILE_TYPES = {
-    "delpher_kranten": KrantenFile
+    "delpher_kranten": KrantenFile,
+    "delpher_kranten_indexed": IndexedKrantenFile,
+    "delpher_kranten_parquet": ParquetKrantenFile
 
 }
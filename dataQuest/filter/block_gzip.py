@@ -0,0 +1,224 @@
+"""
+Block Gzip Module
+
+This module writes and reads indexed, block-compressed issue files.
+
+An indexed issue file is a concatenation of gzip members: one with the
+metadata, one per article, and a closing member. Decompressed as a whole it
+is the same JSON document that is read by KrantenFile, so indexed files are
+valid input for every reader of '.json.gz' files. A sidecar index maps every
+article ID to the offset and length of its member, so a single article can
+be read without decompressing the rest of the issue. The index records the
+size and modification time of the issue file, and is ignored once the issue
+file changes, e.g. when it is converted again without an index.
+"""
+import gzip
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataQuest.settings import ENCODING
+
+INDEX_SUFFIX = ".idx"
+METADATA_FIELD = "newsletter_metadata"
+ARTICLES_FIELD = "articles"
+INDEX_METADATA_FIELD = "metadata"
+INDEX_ARTICLES_FIELD = "articles"
+INDEX_SIZE_FIELD = "size"
+INDEX_MTIME_FIELD = "mtime_ns"
+COMPACT_SEPARATORS = (",", ":")
+DEFAULT_SEPARATORS = (", ", ": ")
+COMPRESS_CHUNK_SIZE = 1 << 20
+"""Number of bytes compressed per gzip member by compress_members."""
+
+
+def index_path(file_path: Union[str, Path]) -> Path:
+    """
+    Get the path of the index of an indexed issue file.
+
+    Args:
+        file_path (Union[str, Path]): The path of the issue file.
+
+    Returns:
+        Path: The path of the index file.
+    """
+    return Path(str(file_path) + INDEX_SUFFIX)
+
+
+def compress_members(data: bytes, compresslevel: int = 9, threads: int = 1,
+                     chunk_size: int = COMPRESS_CHUNK_SIZE) -> bytes:
+    """
+    Compress data as a concatenation of gzip members.
+
+    The data is split into chunks that are compressed independently, so
+    with more than one thread the chunks are compressed in parallel; zlib
+    releases the GIL while compressing. The result decompresses to the
+    original data with any gzip reader.
+
+    Args:
+        data (bytes): The data to compress.
+        compresslevel (int): The gzip compression level.
+        threads (int): Number of threads compressing chunks.
+        chunk_size (int): Number of bytes per gzip member.
+
+    Returns:
+        bytes: The compressed data.
+    """
+    chunks = [data[start:start + chunk_size]
+              for start in range(0, len(data), chunk_size)] or [b""]
+
+    def compress(chunk: bytes) -> bytes:
+        return gzip.compress(chunk, compresslevel, mtime=0)
+
+    if threads <= 1 or len(chunks) == 1:
+        return b"".join(map(compress, chunks))
+    with ThreadPoolExecutor(threads) as executor:
+        return b"".join(executor.map(compress, chunks))
+
+
+def write_block_gzip(data: Dict[str, Any], output_file: Union[str, Path],
+                     compresslevel: int = 9, compact: bool = False) -> None:
+    """
+    Write an issue as an indexed, block-compressed JSON file.
+
+    Args:
+        data (Dict[str, Any]): The issue, with the metadata and articles
+        fields.
+        output_file (Union[str, Path]): The path of the output file. The
+        index is written next to it.
+        compresslevel (int): The gzip compression level.
+        compact (bool): Write JSON without whitespace between items.
+    """
+    separators: Tuple[str, str] = (COMPACT_SEPARATORS if compact
+                                   else DEFAULT_SEPARATORS)
+    item_separator, key_separator = separators
+
+    def dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=separators)
+
+    index: Dict[str, Any] = {INDEX_ARTICLES_FIELD: {}}
+    offset = 0
+    with open(output_file, "wb") as block_file:
+        def write_block(text: str) -> List[int]:
+            nonlocal offset
+            block = gzip.compress(text.encode(ENCODING), compresslevel,
+                                  mtime=0)
+            block_file.write(block)
+            location = [offset, len(block)]
+            offset += len(block)
+            return location
+
+        index[INDEX_METADATA_FIELD] = write_block(
+            f'{{{dumps(METADATA_FIELD)}{key_separator}'
+            f'{dumps(data[METADATA_FIELD])}{item_separator}'
+            f'{dumps(ARTICLES_FIELD)}{key_separator}{{')
+        for i, (article_id, article) in enumerate(
+                data[ARTICLES_FIELD].items()):
+            separator = item_separator if i > 0 else ""
+            index[INDEX_ARTICLES_FIELD][str(article_id)] = write_block(
+                f'{separator}{dumps(str(article_id))}{key_separator}'
+                f'{dumps(article)}')
+        write_block("}}")
+
+    stat = Path(output_file).stat()
+    index[INDEX_SIZE_FIELD] = stat.st_size
+    index[INDEX_MTIME_FIELD] = stat.st_mtime_ns
+    with open(index_path(output_file), "w", encoding=ENCODING) as index_file:
+        json.dump(index, index_file)
+
+
+@lru_cache(maxsize=32)
+def _load_index(index_file: str, index_mtime_ns: int, size: int,
+                mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    Load an index file, caching recently used indexes by their modification
+    time and the size and modification time of their issue file.
+    """
+    # pylint: disable=unused-argument
+    with open(index_file, "r", encoding=ENCODING) as f:
+        index = json.load(f)
+    if index.get(INDEX_SIZE_FIELD) != size or \
+            index.get(INDEX_MTIME_FIELD) != mtime_ns:
+        logging.warning("Ignoring index '%s', which does not match its "
+                        "issue file", index_file)
+        return None
+    return index
+
+
+def read_index(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Read the index of an issue file.
+
+    Args:
+        file_path (Union[str, Path]): The path of the issue file.
+
+    Returns:
+        Optional[Dict[str, Any]]: The index, or None if the file is not
+        indexed or has changed since its index was written.
+    """
+    index_file = index_path(file_path)
+    try:
+        index_mtime_ns = index_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    stat = Path(file_path).stat()
+    return _load_index(str(index_file), index_mtime_ns, stat.st_size,
+                       stat.st_mtime_ns)
+
+
+def read_block(file_path: Union[str, Path], offset: int, length: int) -> str:
+    """
+    Read and decompress a single gzip member of a file.
+
+    Args:
+        file_path (Union[str, Path]): The path of the file.
+        offset (int): The offset of the member in bytes.
+        length (int): The length of the member in bytes.
+
+    Returns:
+        str: The decompressed text of the member.
+    """
+    with open(file_path, "rb") as block_file:
+        block_file.seek(offset)
+        return gzip.decompress(block_file.read(length)).decode(ENCODING)
+
+
+def read_indexed_metadata(file_path: Union[str, Path]) -> (
+        Optional)[Dict[str, Any]]:
+    """
+    Read the metadata of an indexed issue file.
+
+    Args:
+        file_path (Union[str, Path]): The path of the issue file.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata, or None if the file is not
+        indexed.
+    """
+    index = read_index(file_path)
+    if index is None:
+        return None
+    text = read_block(file_path, *index[INDEX_METADATA_FIELD])
+    return json.loads(text + "}}")[METADATA_FIELD]
+
+
+def read_indexed_article(file_path: Union[str, Path],
+                         article_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a single article of an indexed issue file.
+
+    Args:
+        file_path (Union[str, Path]): The path of the issue file.
+        article_id (str): The ID of the article.
+
+    Returns:
+        Optional[Dict[str, Any]]: The article, or None if the file is not
+        indexed or does not contain the article.
+    """
+    index = read_index(file_path)
+    if index is None or article_id not in index[INDEX_ARTICLES_FIELD]:
+        return None
+    text = read_block(file_path, *index[INDEX_ARTICLES_FIELD][article_id])
+    return json.loads("{" + text.lstrip(", ") + "}")[article_id]
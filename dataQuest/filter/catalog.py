@@ -0,0 +1,147 @@
+"""
+Catalog Module
+
+This module provides a catalog of the metadata of the input files of a
+corpus, stored in SQLite. Document-level filters can be evaluated against
+the catalog, so input files that are rejected on their metadata are never
+opened.
+"""
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from dataQuest.filter.document import Document
+from dataQuest.filter.document_filter import DocumentFilter
+from dataQuest.filter.input_file import InputFile
+
+CATALOG_TABLE = "issues"
+
+
+class CorpusCatalog:
+    """
+    Catalog of the metadata of input files.
+
+    Every input file is stored with its title, date, language, number of
+    articles, size and modification time. Entries of files whose size or
+    modification time changed are considered stale.
+
+    Attributes:
+        catalog_path (Path): The path of the SQLite database.
+    """
+
+    def __init__(self, catalog_path: Path) -> None:
+        """
+        Open the catalog, creating it if it does not exist.
+
+        Args:
+            catalog_path (Path): The path of the SQLite database.
+        """
+        self.catalog_path = catalog_path
+        self._connection = sqlite3.connect(str(catalog_path))
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} ("
+            "path TEXT PRIMARY KEY, title TEXT, date TEXT, language TEXT, "
+            "article_count INTEGER, size INTEGER, mtime REAL)")
+        self._connection.commit()
+
+    def __enter__(self) -> "CorpusCatalog":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the catalog."""
+        self._connection.close()
+
+    @staticmethod
+    def _key(input_file: InputFile) -> str:
+        """Get the key of an input file in the catalog."""
+        return str(Path(input_file.filepath).resolve())
+
+    def _lookup(self, input_file: InputFile) -> Optional[Tuple]:
+        """
+        Look up the up-to-date entry of an input file.
+
+        Returns:
+            Optional[Tuple]: The title, date and language of the input
+            file, or None if it is not in the catalog or its entry is stale.
+        """
+        row = self._connection.execute(
+            f"SELECT title, date, language, size, mtime FROM {CATALOG_TABLE} "
+            "WHERE path = ?", (self._key(input_file),)).fetchone()
+        if row is None:
+            return None
+        stat = Path(input_file.filepath).stat()
+        if row[3] != stat.st_size or row[4] != stat.st_mtime:
+            return None
+        return row[:3]
+
+    def refresh(self, input_files: Iterable[InputFile]) -> Tuple[int, int]:
+        """
+        Add new and changed input files to the catalog, and remove entries
+        of files that no longer exist.
+
+        Args:
+            input_files (Iterable[InputFile]): The input files of the
+            corpus.
+
+        Returns:
+            Tuple[int, int]: The number of added or updated entries and the
+            number of removed entries.
+        """
+        updated = 0
+        for input_file in input_files:
+            if self._lookup(input_file) is not None:
+                continue
+            stat = Path(input_file.filepath).stat()
+            document = input_file.read_doc()
+            if document is None:
+                logging.error("Cannot add '%s' to the catalog",
+                              input_file.filepath)
+                continue
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {CATALOG_TABLE} "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._key(input_file), document.title,
+                 document.publish_date, document.language,
+                 len(document.articles), stat.st_size, stat.st_mtime))
+            updated += 1
+            if updated % 1000 == 0:
+                self._connection.commit()
+
+        removed = [(path,) for (path,) in self._connection.execute(
+            f"SELECT path FROM {CATALOG_TABLE}") if not Path(path).exists()]
+        self._connection.executemany(
+            f"DELETE FROM {CATALOG_TABLE} WHERE path = ?", removed)
+        self._connection.commit()
+        return updated, len(removed)
+
+    def prune(self, input_files: Iterable[InputFile],
+              document_filter: DocumentFilter) -> List[InputFile]:
+        """
+        Remove input files whose metadata is rejected by a filter.
+
+        Input files that are not in the catalog, or whose entries are
+        stale, are kept.
+
+        Args:
+            input_files (Iterable[InputFile]): The input files.
+            document_filter (DocumentFilter): The filter to evaluate on the
+            metadata of the input files.
+
+        Returns:
+            List[InputFile]: The input files that may contain selected
+            articles.
+        """
+        selected = []
+        for input_file in input_files:
+            entry = self._lookup(input_file)
+            if entry is not None:
+                title, date, language = entry
+                document = Document(title=title, publish_date=date,
+                                    language=language)
+                if not document_filter.filter_document(document):
+                    continue
+            selected.append(input_file)
+        return selected
@@ -0,0 +1,159 @@
+"""
+Checkpoint Module
+
+This module provides a journal of the input files that a filter run has
+completed, so an interrupted run can be resumed.
+"""
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from dataQuest.filter.input_file import InputFile
+from dataQuest.settings import ENCODING
+
+JOURNAL_FILE_NAME = "filter_checkpoint.jsonl"
+CONFIG_HASH_FIELD = "config_hash"
+
+
+def config_fingerprint(config_path: Path, *options: str) -> str:
+    """
+    Compute a fingerprint of the filters in a configuration file.
+
+    Args:
+        config_path (Path): Path to the configuration file.
+        *options (str): Other options that change the output of a run.
+
+    Returns:
+        str: The fingerprint.
+    """
+    with open(config_path, "r", encoding=ENCODING) as f:
+        filters = json.load(f)["filters"]
+    content = json.dumps([filters, list(options)], sort_keys=True)
+    return hashlib.sha256(content.encode(ENCODING)).hexdigest()
+
+
+class CheckpointJournal:
+    """
+    Journal of the input files completed by a filter run.
+
+    Every completed input file is recorded with its size and modification
+    time. Records are only written by commit(), which must be called after
+    the output of the recorded files is written, so the journal never
+    contains files whose output was lost.
+
+    Attributes:
+        path (Path): The path of the journal file.
+        config_hash (str): The fingerprint of the configuration of the run.
+    """
+
+    def __init__(self, output_dir: Path, config_hash: str,
+                 resume: bool = True) -> None:
+        """
+        Open the journal in an output directory.
+
+        Args:
+            output_dir (Path): The output directory of the run.
+            config_hash (str): The fingerprint of the configuration of the
+            run, see config_fingerprint.
+            resume (bool): Keep the records of a previous run with the same
+            configuration. Otherwise the journal is started afresh.
+        """
+        self.path = output_dir / JOURNAL_FILE_NAME
+        self.config_hash = config_hash
+        self._completed: Dict[str, Tuple[int, float]] = {}
+        self._pending: List[Dict[str, Any]] = []
+
+        if resume and self.path.is_file():
+            self._completed = self._read()
+
+        # pylint: disable=consider-using-with
+        if self._completed:
+            self._file: Optional[TextIO] = open(self.path, "a",
+                                                encoding=ENCODING)
+        else:
+            self._file = open(self.path, "w", encoding=ENCODING)
+            self._file.write(json.dumps({CONFIG_HASH_FIELD: config_hash})
+                             + "\n")
+            self._file.flush()
+
+    def _read(self) -> Dict[str, Tuple[int, float]]:
+        """Read the records of a previous run with the same
+        configuration."""
+        completed: Dict[str, Tuple[int, float]] = {}
+        with open(self.path, "r", encoding=ENCODING) as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                return completed
+            if header.get(CONFIG_HASH_FIELD) != self.config_hash:
+                logging.info("Configuration changed, not resuming from %s",
+                             self.path)
+                return completed
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                completed[record["path"]] = (record["size"], record["mtime"])
+        return completed
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def resumed(self) -> bool:
+        """True if the journal continues the records of a previous run."""
+        return bool(self._completed)
+
+    @staticmethod
+    def _record(input_file: InputFile) -> Dict[str, Any]:
+        """Describe the current state of an input file."""
+        stat = Path(input_file.filepath).stat()
+        return {"path": str(input_file.filepath), "size": stat.st_size,
+                "mtime": stat.st_mtime}
+
+    def is_completed(self, input_file: InputFile) -> bool:
+        """
+        Check whether an unchanged input file was completed before.
+
+        Args:
+            input_file (InputFile): The input file.
+
+        Returns:
+            bool: True if the file was completed and its size and
+            modification time did not change since.
+        """
+        completed = self._completed.get(str(input_file.filepath))
+        if completed is None:
+            return False
+        record = self._record(input_file)
+        return completed == (record["size"], record["mtime"])
+
+    def mark_completed(self, input_file: InputFile) -> None:
+        """
+        Record that an input file is completed, on the next commit.
+
+        Args:
+            input_file (InputFile): The input file.
+        """
+        self._pending.append(self._record(input_file))
+
+    def commit(self) -> None:
+        """Write the pending records to the journal."""
+        if self._file is None or not self._pending:
+            return
+        self._file.writelines(json.dumps(record) + "\n"
+                              for record in self._pending)
+        self._file.flush()
+        self._pending = []
+
+    def close(self) -> None:
+        """Write the pending records and close the journal."""
+        self.commit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
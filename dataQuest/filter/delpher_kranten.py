@@ -7,9 +7,14 @@ This module provides classes and functions for handling Delpher Kranten files.
 import json
 import logging
 import os
-from typing import Optional
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from dataQuest.filter.block_gzip import read_indexed_article
 from dataQuest.filter.document import Document, Article
 from dataQuest.filter.input_file import InputFile
+from dataQuest.filter.parquet_store import (list_issues, read_issue_metadata,
+                                            read_issue_articles)
 
 
 class KrantenFile(InputFile):
@@ -28,14 +33,18 @@ class KrantenFile(InputFile):
         ARTICLE_TITLE_FIELD (str): The key for title field in an article.
         ARTICLE_BODY_FIELD (str): The key for body field in an article.
         ENCODING (str): The encoding format for reading the file.
+        METADATA_CHUNK_SIZE (int): Number of characters read at a time
+        while looking for the metadata.
 
     Methods:
         read_json(json_file): Read JSON data from a file and parse it into
         a Document object.
+        read_metadata(json_file): Read only the metadata at the start of
+        a JSON file.
         base_file_name(): Extract the base file name without extension from
         the filepath.
-        doc(): Read the directory and parse the JSON file into a Document
-        object.
+        read_doc(): Read the directory and parse the JSON file into a
+        Document object.
     """
 
     METADATA_FIELD = "newsletter_metadata"
@@ -46,6 +55,9 @@ class KrantenFile(InputFile):
     ARTICLE_TITLE_FIELD = "title"
     ARTICLE_BODY_FIELD = "body"
     ENCODING = "utf-8"
+    METADATA_CHUNK_SIZE = 4096
+
+    _METADATA_PREFIX = re.compile(r'\s*\{\s*"' + METADATA_FIELD + r'"\s*:\s*')
 
     def read_json(self, json_file) -> Optional[Document]:
         """
@@ -65,15 +77,7 @@ class KrantenFile(InputFile):
             publish_date = metadata[self.DATE_FIELD]
             language = metadata[self.LANGUAGE_FIELD]
 
-            articles_data = json_data[self.ARTICLES_FIELD]
-
-            articles = []
-            for article_id, article in articles_data.items():
-                article_title = article[self.ARTICLE_TITLE_FIELD]
-                article_body = article[self.ARTICLE_BODY_FIELD]
-                article = Article(article_id=article_id, title=article_title,
-                                  body=article_body)
-                articles.append(article)
+            articles = self._parse_articles(json_data[self.ARTICLES_FIELD])
 
             document = Document(title=document_title,
                                 publish_date=publish_date,
@@ -85,6 +89,75 @@ class KrantenFile(InputFile):
             logging.error("Error parsing JSON data: %s", e)
             return None
 
+    def _parse_articles(self, articles_data: Dict[str, Any]) -> List[Article]:
+        """
+                Build Article objects from the articles field of the JSON
+                data.
+
+                Args:
+                    articles_data (Dict[str, Any]): The articles field,
+                    mapping article IDs to titles and bodies.
+
+                Returns:
+                    List[Article]: The parsed articles.
+        """
+        articles = []
+        for article_id, article in articles_data.items():
+            article_title = article[self.ARTICLE_TITLE_FIELD]
+            article_body = article[self.ARTICLE_BODY_FIELD]
+            articles.append(Article(article_id=article_id, title=article_title,
+                                    body=article_body))
+        return articles
+
+    def read_metadata(self, json_file) -> Optional[Dict[str, Any]]:
+        """
+                Read only the metadata at the start of a JSON file.
+
+                The file is read in chunks until the metadata object is
+                complete, so the articles are neither decompressed nor
+                parsed.
+
+                Args:
+                    json_file: A file object containing JSON data.
+
+                Returns:
+                    Optional[Dict[str, Any]]: The metadata, or None if the
+                    metadata is not the first field of the JSON data.
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        while True:
+            chunk = json_file.read(self.METADATA_CHUNK_SIZE)
+            buffer += chunk
+            if ":" in buffer:
+                match = self._METADATA_PREFIX.match(buffer)
+                if match is None:
+                    return None
+                try:
+                    metadata, _ = decoder.raw_decode(buffer, match.end())
+                    return metadata
+                except json.JSONDecodeError:
+                    pass
+            if not chunk:
+                return None
+
+    def _read_articles(self) -> List[Article]:
+        """
+                Parse all articles of the input file.
+
+                Returns:
+                    List[Article]: The articles, or an empty list if
+                    parsing fails.
+        """
+        try:
+            with self.open(encoding=self.ENCODING) as fh:
+                json_data = json.load(fh)
+            return self._parse_articles(json_data[self.ARTICLES_FIELD])
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            logging.error("Error parsing articles of '%s': %s",
+                          self._filepath, e)
+            return []
+
     def base_file_name(self) -> str:
         """
                Extract the base file name without extension from the filepath.
@@ -96,23 +169,176 @@ class KrantenFile(InputFile):
         base_file_name = os.path.splitext(file_name_json)[0]
         return base_file_name
 
-    def doc(self) -> Optional[Document]:
+    def read_doc(self) -> Optional[Document]:
         """
                 Read the directory and parse the JSON file into a Document
                 object.
 
+                Only the metadata is read here. The articles are parsed when
+                they are first accessed, so documents rejected by document
+                level filters are never parsed completely.
+
                 Returns:
                     Optional[Document]: A Document object parsed from the
                     JSON data, or None if parsing fails.
         """
         try:
             logging.info("Reading directory '%s'...", self._filepath)
-            fh = self.open(encoding=self.ENCODING)
-            document = self.read_json(fh)
-            fh.close()
-            return document
+            with self.open(encoding=self.ENCODING) as fh:
+                metadata = self.read_metadata(fh)
+            if metadata is None:
+                with self.open(encoding=self.ENCODING) as fh:
+                    return self.read_json(fh)
+
+            return Document(title=metadata[self.TITLE_FIELD],
+                            publish_date=metadata[self.DATE_FIELD],
+                            language=metadata[self.LANGUAGE_FIELD],
+                            articles_loader=self._read_articles)
 
+        except KeyError as e:
+            logging.error("Error parsing JSON data: %s", e)
+            return None
         except OSError as e:
             logging.error("Error processing gzip file '%s': %s",
                           self._filepath, e)
             return None
+
+
+class IndexedKrantenFile(KrantenFile):
+    """
+    A KrantenFile written as an indexed, block-compressed file.
+
+    Such files are written by XMLExtractor with indexed=True. They can be
+    read as a whole like any KrantenFile, and single articles can be read
+    through the index without decompressing the rest of the issue.
+
+    Methods:
+        read_article(article_id): Read a single article through the index.
+    """
+
+    def read_article(self, article_id: str) -> Optional[Article]:
+        """
+                Read a single article through the index.
+
+                Args:
+                    article_id (str): The ID of the article.
+
+                Returns:
+                    Optional[Article]: The article, or None if the file is
+                    not indexed or does not contain the article.
+        """
+        try:
+            article = read_indexed_article(self._filepath, article_id)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error("Error reading article %s from '%s': %s",
+                          article_id, self._filepath, e)
+            return None
+        if article is None:
+            return None
+        return Article(article_id=article_id,
+                       title=article[self.ARTICLE_TITLE_FIELD],
+                       body=article[self.ARTICLE_BODY_FIELD])
+
+
+class ParquetKrantenFile(KrantenFile):
+    """
+    An issue of Delpher Kranten read from a Parquet store.
+
+    Parquet stores are written by convert-to-parquet. The input files of
+    this type are the shards of a store; every shard holds many issues.
+    The file path of an issue is that of the '.json.gz' file it was
+    converted from, so filtered articles still refer to that file. The
+    metadata is read without the article columns, and the articles are
+    read when they are first accessed.
+
+    Attributes:
+        shard_path (Optional[Path]): The shard that holds the issue. If
+        None, the issue is read from its '.json.gz' file.
+        row_group (int): The row group of the issue in the shard.
+        offset (int): The first row of the issue in the row group.
+        length (int): The number of articles of the issue.
+
+    Methods:
+        list_files(path): Create the input files of the issues in a shard.
+    """
+
+    def __init__(self, filepath: Path, shard_path: Optional[Path] = None,
+                 row_group: int = 0, offset: int = 0,
+                 length: int = 0) -> None:
+        """
+               Initialize the ParquetKrantenFile.
+
+               Args:
+                   filepath (Path): The path of the '.json.gz' file of the
+                   issue.
+                   shard_path (Optional[Path]): The shard that holds the
+                   issue.
+                   row_group (int): The row group of the issue.
+                   offset (int): The first row of the issue in the row
+                   group.
+                   length (int): The number of articles of the issue.
+        """
+        super().__init__(filepath)
+        self.shard_path = shard_path
+        self.row_group = row_group
+        self.offset = offset
+        self.length = length
+
+    @classmethod
+    def list_files(cls, path: Path) -> List[InputFile]:
+        """
+                Create the input files of the issues in a shard.
+
+                Only the file path column of the shard is read.
+
+                Args:
+                    path (Path): The path of the shard.
+
+                Returns:
+                    List[InputFile]: The issues, in the order of the shard.
+        """
+        return [cls(Path(file_path), path, row_group, offset, length)
+                for file_path, row_group, offset, length in list_issues(path)]
+
+    def read_doc(self) -> Optional[Document]:
+        """
+                Read the metadata of the issue from the shard.
+
+                Returns:
+                    Optional[Document]: A Document object whose articles
+                    are read when they are first accessed, or None if the
+                    shard cannot be read.
+        """
+        if self.shard_path is None:
+            return super().read_doc()
+        try:
+            metadata = read_issue_metadata(self.shard_path, self.row_group,
+                                           self.offset)
+        except (OSError, ValueError, IndexError) as e:
+            logging.error("Error reading '%s' from '%s': %s", self._filepath,
+                          self.shard_path, e)
+            return None
+        return Document(title=metadata[self.TITLE_FIELD],
+                        publish_date=metadata[self.DATE_FIELD],
+                        language=metadata[self.LANGUAGE_FIELD],
+                        articles_loader=self._read_articles)
+
+    def _read_articles(self) -> List[Article]:
+        """
+                Read the articles of the issue from the shard.
+
+                Returns:
+                    List[Article]: The articles, or an empty list if the
+                    shard cannot be read.
+        """
+        if self.shard_path is None:
+            return super()._read_articles()
+        try:
+            articles = read_issue_articles(self.shard_path, self.row_group,
+                                           self.offset, self.length)
+        except (OSError, ValueError) as e:
+            logging.error("Error reading articles of '%s' from '%s': %s",
+                          self._filepath, self.shard_path, e)
+            return []
+        return [Article(article_id=article_id, title=title, body=body)
+                for article_id, title, body in articles]
@@ -4,23 +4,56 @@ This module defines the Document class, which represents a document
 containing articles.
 """
 import logging
-from typing import Optional, List, Union
+from typing import Callable, Optional, List, Union, cast
 from datetime import datetime
 
 
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def parse_date(date: str) -> datetime:
+    """Parse a date in the format 'YYYY-MM-DD'.
+
+        Dates in exactly this format are parsed from fixed positions, which
+        is much faster than datetime.strptime. Other dates are parsed with
+        strptime, so results and errors are the same.
+
+        Args:
+            date (str): The date.
+
+        Returns:
+            datetime: The parsed date.
+
+        Raises:
+            ValueError: If the date is not a valid date in the format.
+    """
+    if len(date) == 10 and date[4] == '-' and date[7] == '-' \
+            and date.isascii():
+        year, month, day = date[:4], date[5:7], date[8:10]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            try:
+                return datetime(int(year), int(month), int(day))
+            except ValueError:
+                pass
+    return datetime.strptime(date, DATE_FORMAT)
+
+
 class Article:
     """A class representing an article.
 
         This class represents an article with an ID, title, and body text.
-        The body text can be provided as a list
-        of paragraphs, which will be joined into a single string.
+        The body text can be provided as a list of paragraphs, which are
+        joined into a single string when text is first accessed, so
+        articles rejected on their title are never joined.
 
         Attributes:
             id (str): The unique identifier of the article.
             title (str): The title of the article.
-            body (str): The body text of the article, represented as
+            text (str): The body text of the article, represented as
             a single string.
     """
+    __slots__ = ("id", "title", "_body", "_text")
+
     def __init__(self, article_id: str, title: str,
                  body: Union[str, List[str]]) -> None:
         """Initialize an Article object with the given ID, title, and body.
@@ -33,15 +66,30 @@ class Article:
         """
         self.id = article_id
         self.title = title
+        self._body: Optional[List[str]] = None
+        self._text: Optional[str] = None
         if isinstance(body, list):
-            if any(item is None for item in body):
+            self._body = body
+        else:
+            self._text = body
+
+    @property
+    def text(self) -> str:
+        """
+            Getter for the body text of the article.
+
+            Returns:
+                str: The paragraphs of the body joined by newlines, or an
+                empty string if any paragraph is None.
+        """
+        if self._body is not None:
+            if any(item is None for item in self._body):
                 logging.warning("There is a None value in body")
-                self.text = ""
+                self._text = ""
             else:
-                article_body = '\n'.join(body)
-                self.text = article_body
-        else:
-            self.text = body
+                self._text = '\n'.join(self._body)
+            self._body = None
+        return cast(str, self._text)
 
 
 class Document:
@@ -53,8 +101,12 @@ class Document:
             publish_date (str): The publication date of the document in
             the format 'YYYY-MM-DD'.
             language (str): The language of the document.
-            articles (List[Article]): A list of articles included in
-             the document.
+            articles (Optional[List[Article]]): A list of articles
+             included in the document.
+            articles_loader (Optional[Callable[[], List[Article]]]): A
+             function that returns the articles. It is called on the first
+             access of articles when no articles are given, so documents
+             can be filtered on their metadata without parsing articles.
 
         Attributes:
             _title (str): The title of the document.
@@ -76,10 +128,16 @@ class Document:
             articles (List[Article]): Getter for the list of articles
             included in the document.
     """
+    __slots__ = ("_title", "_publish_date", "_language", "_year",
+                 "_articles", "_articles_loader")
+
     def __init__(self, title: str, publish_date: str, language: str,
-                 articles: List[Article]) -> None:
+                 articles: Optional[List[Article]] = None,
+                 articles_loader: Optional[Callable[[], List[Article]]] = None
+                 ) -> None:
         self._year: Optional[int] = None
         self._articles = articles
+        self._articles_loader = articles_loader
         self._title = title
         self._publish_date = publish_date
         self._language = language
@@ -104,6 +162,16 @@ class Document:
         """
         return self._publish_date
 
+    @property
+    def language(self) -> str:
+        """
+           Getter for the language of the document.
+
+           Returns:
+               str: The language of the document.
+        """
+        return self._language
+
     @property
     def year(self) -> Optional[int]:
         """
@@ -116,8 +184,7 @@ class Document:
         if self._year is not None:
             return self._year
         try:
-            date_obj = datetime.strptime(self._publish_date, '%Y-%m-%d')
-            self._year = date_obj.year
+            self._year = parse_date(self._publish_date).year
             return self._year
         except ValueError:
             return None
@@ -143,4 +210,8 @@ class Document:
             Returns:
                 List[Article]: The list of articles included in the document.
         """
+        if self._articles is None:
+            self._articles = (self._articles_loader()
+                              if self._articles_loader is not None else [])
+            self._articles_loader = None
         return self._articles
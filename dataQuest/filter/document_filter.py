@@ -5,6 +5,7 @@ This module provides classes for filtering documents and articles.
 from abc import ABC, abstractmethod
 from typing import List
 from dataQuest.filter.document import Document, Article
+from dataQuest.filter.keyword_matcher import KeywordMatcher
 
 
 class DocumentFilter(ABC):
@@ -132,11 +133,21 @@ class KeywordsFilter(DocumentFilter):
     """
         Filter documents and articles by keywords.
 
+        The keywords are compiled once into a KeywordMatcher, which scans
+        the title and text of an article once for all keywords.
+
         Attributes:
             keywords (List[str]): The list of keywords to filter by.
+            ignore_case (bool): Match keywords regardless of case.
+            whole_words (bool): Only match keywords that are not part of
+            a larger word.
     """
-    def __init__(self, keywords: List[str]):
+    def __init__(self, keywords: List[str], ignore_case: bool = False,
+                 whole_words: bool = False):
         self.keywords = keywords
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        self.matcher = KeywordMatcher(keywords, ignore_case, whole_words)
 
     def filter_document(self, document: Document) -> bool:
         """
@@ -161,8 +172,7 @@ class KeywordsFilter(DocumentFilter):
                     bool: True if the article's title or text contains any
                     of the specified keywords, False otherwise.
         """
-        return any(keyword in article.title or keyword in article.text for
-                   keyword in self.keywords)
+        return self.matcher.matches_any(article.title, article.text)
 
 
 class ArticleTitleFilter(DocumentFilter):
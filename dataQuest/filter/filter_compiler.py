@@ -0,0 +1,236 @@
+"""
+Filter Compiler Module
+This module compiles a tree of document filters into an evaluator that
+checks cheap and selective predicates first.
+"""
+from typing import Any, Callable, List, Optional
+from dataQuest.filter.document import Document, Article
+from dataQuest.filter.document_filter import (DocumentFilter, TitleFilter,
+                                              YearFilter, DecadeFilter,
+                                              KeywordsFilter,
+                                              ArticleTitleFilter, AndFilter,
+                                              OrFilter, NotFilter)
+
+DOCUMENT_LEVEL = "document"
+ARTICLE_LEVEL = "article"
+
+DOCUMENT_FILTERS = (TitleFilter, YearFilter, DecadeFilter)
+"""Filters that only check document metadata."""
+ARTICLE_FILTERS = (KeywordsFilter, ArticleTitleFilter)
+"""Filters that only check articles."""
+
+FILTER_COSTS = {
+    TitleFilter: 1.0,
+    YearFilter: 1.0,
+    DecadeFilter: 1.0,
+    ArticleTitleFilter: 2.0,
+    KeywordsFilter: 10.0,
+}
+"""Estimated relative cost of evaluating a filter."""
+DEFAULT_FILTER_COST = 5.0
+
+REORDER_INTERVAL = 1000
+"""Number of evaluations after which children are reordered."""
+
+
+class Plan:
+    """
+    A compiled predicate on documents or articles.
+
+    Attributes:
+        cost (float): The estimated cost of an evaluation.
+        evaluations (int): The number of evaluations.
+        passes (int): The number of evaluations that returned True.
+    """
+    def __init__(self, cost: float) -> None:
+        self.cost = cost
+        self.evaluations = 0
+        self.passes = 0
+
+    def __call__(self, item: Any) -> bool:
+        self.evaluations += 1
+        result = self.evaluate(item)
+        if result:
+            self.passes += 1
+        return result
+
+    def evaluate(self, item: Any) -> bool:
+        """Evaluate the predicate on a document or an article."""
+        raise NotImplementedError("Subclass must implement evaluate method")
+
+    def pass_rate(self) -> float:
+        """The observed fraction of evaluations that returned True, with
+        add-one smoothing."""
+        return (self.passes + 1) / (self.evaluations + 2)
+
+
+class Constant(Plan):
+    """A predicate with a constant result."""
+    def __init__(self, value: bool) -> None:
+        super().__init__(0.0)
+        self.value = value
+
+    def evaluate(self, item: Any) -> bool:
+        return self.value
+
+
+class Leaf(Plan):
+    """A predicate that calls a single filter method."""
+    def __init__(self, check: Callable[[Any], bool], cost: float) -> None:
+        super().__init__(cost)
+        self.check = check
+
+    def evaluate(self, item: Any) -> bool:
+        return self.check(item)
+
+
+class Negation(Plan):
+    """A predicate that negates another predicate."""
+    def __init__(self, plan: Plan) -> None:
+        super().__init__(plan.cost)
+        self.plan = plan
+
+    def evaluate(self, item: Any) -> bool:
+        return not self.plan(item)
+
+
+class Conjunction(Plan):
+    """
+    A predicate that is True if all children are True.
+
+    Children are periodically reordered so that those that are cheap and
+    most likely to return False are evaluated first.
+    """
+    def __init__(self, children: List[Plan]) -> None:
+        super().__init__(sum(child.cost for child in children))
+        self.children = children
+        self.reorder()
+
+    def reorder(self) -> None:
+        """Order children by expected cost per rejection."""
+        self.children.sort(
+            key=lambda child: child.cost / (1.0 - child.pass_rate()))
+
+    def evaluate(self, item: Any) -> bool:
+        if self.evaluations % REORDER_INTERVAL == 0:
+            self.reorder()
+        for child in self.children:
+            if not child(item):
+                return False
+        return True
+
+
+class Disjunction(Plan):
+    """
+    A predicate that is True if any child is True.
+
+    Children are periodically reordered so that those that are cheap and
+    most likely to return True are evaluated first.
+    """
+    def __init__(self, children: List[Plan]) -> None:
+        super().__init__(sum(child.cost for child in children))
+        self.children = children
+        self.reorder()
+
+    def reorder(self) -> None:
+        """Order children by expected cost per acceptance."""
+        self.children.sort(key=lambda child: child.cost / child.pass_rate())
+
+    def evaluate(self, item: Any) -> bool:
+        if self.evaluations % REORDER_INTERVAL == 0:
+            self.reorder()
+        for child in self.children:
+            if child(item):
+                return True
+        return False
+
+
+def compile_plan(document_filter: DocumentFilter,
+                 level: str) -> Optional[Plan]:
+    """
+    Compile the document or article level predicate of a filter.
+
+    Nested AndFilter and OrFilter nodes are flattened, and children that
+    always pass at the given level are removed.
+
+    Args:
+        document_filter (DocumentFilter): The filter to compile.
+        level (str): 'document' or 'article'.
+
+    Returns:
+        Optional[Plan]: The compiled predicate, or None if the filter
+        always passes at the given level.
+    """
+    if isinstance(document_filter, (AndFilter, OrFilter)):
+        is_and = isinstance(document_filter, AndFilter)
+        children: List[Plan] = []
+        for child_filter in document_filter.filters:
+            child = compile_plan(child_filter, level)
+            if child is None:
+                if is_and:
+                    continue
+                return None
+            if isinstance(child, Conjunction if is_and else Disjunction):
+                children.extend(child.children)
+            else:
+                children.append(child)
+        if not children:
+            return None if is_and else Constant(False)
+        if len(children) == 1:
+            return children[0]
+        return Conjunction(children) if is_and else Disjunction(children)
+
+    if isinstance(document_filter, NotFilter):
+        if document_filter.level not in (level, 'both'):
+            return None
+        inner = compile_plan(document_filter.filter, level)
+        return Constant(False) if inner is None else Negation(inner)
+
+    if level == DOCUMENT_LEVEL and isinstance(document_filter,
+                                              ARTICLE_FILTERS):
+        return None
+    if level == ARTICLE_LEVEL and isinstance(document_filter,
+                                             DOCUMENT_FILTERS):
+        return None
+    cost = FILTER_COSTS.get(type(document_filter), DEFAULT_FILTER_COST)
+    if level == DOCUMENT_LEVEL:
+        return Leaf(document_filter.filter_document, cost)
+    return Leaf(document_filter.filter_article, cost)
+
+
+class CompiledFilter(DocumentFilter):
+    """
+    A filter that evaluates a compiled filter tree.
+
+    The document and article level predicates of the tree are compiled
+    separately, so document filters are never evaluated on articles and
+    article filters are never evaluated on documents. The results are the
+    same as those of the original filter.
+
+    Attributes:
+        source (DocumentFilter): The original filter.
+    """
+    def __init__(self, source: DocumentFilter):
+        self.source = source
+        self._document_plan = compile_plan(source, DOCUMENT_LEVEL)
+        self._article_plan = compile_plan(source, ARTICLE_LEVEL)
+
+    def filter_document(self, document: Document) -> bool:
+        return self._document_plan is None or self._document_plan(document)
+
+    def filter_article(self, article: Article) -> bool:
+        return self._article_plan is None or self._article_plan(article)
+
+
+def compile_filter(document_filter: DocumentFilter) -> CompiledFilter:
+    """
+    Compile a filter tree into a single evaluator.
+
+    Args:
+        document_filter (DocumentFilter): The filter to compile, e.g. as
+        loaded by load_filters_from_config.
+
+    Returns:
+        CompiledFilter: The compiled filter.
+    """
+    return CompiledFilter(document_filter)
@@ -6,10 +6,78 @@ This module provides an abstract class for representing various input files.
 import abc
 import gzip
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Iterable, TextIO, cast, Optional
+from typing import Iterable, List, TextIO, cast, Optional
 from dataQuest.filter.document import Document, Article
 from dataQuest.filter.document_filter import DocumentFilter
+from dataQuest.settings import DOCUMENT_CACHE_SIZE
+
+
+class DocumentCache:
+    """
+    Least recently used cache of parsed documents.
+
+    Attributes:
+        maxsize (int): The maximum number of documents kept in the cache.
+        hits (int): The number of lookups answered from the cache, i.e.
+        the number of parses avoided.
+        misses (int): The number of lookups that required a parse.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+               Initialize an empty cache.
+
+               Args:
+                   maxsize (int): The maximum number of documents kept in
+                   the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[str, Document]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Document]:
+        """
+                Look up a document and mark it as recently used.
+
+                Args:
+                    key (str): The key of the document.
+
+                Returns:
+                    Optional[Document]: The cached document, or None if
+                    it is not in the cache.
+        """
+        document = self._documents.get(key)
+        if document is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._documents.move_to_end(key)
+        return document
+
+    def put(self, key: str, document: Document) -> None:
+        """
+                Add a document, evicting the least recently used one
+                if the cache is full.
+
+                Args:
+                    key (str): The key of the document.
+                    document (Document): The document to cache.
+        """
+        if self.maxsize <= 0:
+            return
+        self._documents[key] = document
+        self._documents.move_to_end(key)
+        while len(self._documents) > self.maxsize:
+            self._documents.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all documents and reset the counters."""
+        self._documents.clear()
+        self.hits = 0
+        self.misses = 0
 
 
 class InputFile(abc.ABC):
@@ -18,17 +86,23 @@ class InputFile(abc.ABC):
 
     Attributes:
         _filepath (Path): The file path of the input file.
+        document_cache (DocumentCache): Cache of parsed documents, shared
+        by all input files.
 
     Methods:
         __init__(filepath): Initialize the InputFile with a file path.
+        list_files(path): Create the input files stored at a path.
         filepath(): Get the file path of the input file.
         base_file_name(): Output a list of documents in the input file.
         open(mode, encoding): Open the input file for reading.
         articles(): Return all articles for the document found in the
         input file.
         doc(): Output a list of documents in the input file.
+        read_doc(): Parse the document in the input file.
     """
 
+    document_cache = DocumentCache(DOCUMENT_CACHE_SIZE)
+
     def __init__(self, filepath: Path) -> None:
         """
                Initialize the InputFile with a file path.
@@ -38,6 +112,24 @@ class InputFile(abc.ABC):
         """
         self._filepath = filepath
 
+    @classmethod
+    def list_files(cls, path: Path) -> List["InputFile"]:
+        """
+                Create the input files stored at a path.
+
+                Most input types store one document per file. Input types
+                that store several documents in one file override this
+                method.
+
+                Args:
+                    path (Path): A path that matched the glob pattern of
+                    the input files.
+
+                Returns:
+                    List[InputFile]: The input files.
+        """
+        return [cls(path)]
+
     @property
     def filepath(self) -> Path:
         """
@@ -96,13 +188,29 @@ class InputFile(abc.ABC):
                           self.filepath)
             return
 
-    @abc.abstractmethod
     def doc(self) -> Optional[Document]:
         """
             Output a list of documents in the input file.
 
             This can be a singleton list if an input file contains only
-            one document.
+            one document. Parsed documents are kept in document_cache, so
+            repeated calls do not parse the input file again.
+
+            Returns:
+                Document: A document object.
+        """
+        key = str(self._filepath)
+        document = self.document_cache.get(key)
+        if document is None:
+            document = self.read_doc()
+            if document is not None:
+                self.document_cache.put(key, document)
+        return document
+
+    @abc.abstractmethod
+    def read_doc(self) -> Optional[Document]:
+        """
+            Parse the document in the input file.
 
             Returns:
                 Document: A document object.
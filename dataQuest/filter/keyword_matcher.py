@@ -0,0 +1,106 @@
+"""
+Keyword Matcher Module
+This module provides a matcher that searches texts for any of a set of
+keywords in a single pass.
+"""
+import re
+from typing import Iterable, List
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class KeywordMatcher:
+    """
+    Match any of a set of keywords in texts.
+
+    The keywords are compiled once into an Aho-Corasick automaton, which
+    finds all keywords in a single scan of a text. If the optional
+    'pyahocorasick' package is not installed, a compiled regular expression
+    is used instead.
+
+    Attributes:
+        keywords (List[str]): The keywords to match.
+        ignore_case (bool): Match keywords regardless of case.
+        whole_words (bool): Only match keywords that are not part of a
+        larger word.
+    """
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False,
+                 whole_words: bool = False) -> None:
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        self.keywords: List[str] = [self._normalize(keyword)
+                                    for keyword in keywords]
+        self._match_empty = "" in self.keywords and not whole_words
+        keywords_to_match = sorted({keyword for keyword in self.keywords
+                                    if keyword}, key=len, reverse=True)
+
+        self._automaton = None
+        self._pattern = None
+        if not keywords_to_match:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords_to_match:
+                self._automaton.add_word(keyword, len(keyword))
+            self._automaton.make_automaton()
+        else:
+            pattern = "|".join(re.escape(keyword)
+                               for keyword in keywords_to_match)
+            if whole_words:
+                pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+            self._pattern = re.compile(pattern)
+
+    def _normalize(self, text: str) -> str:
+        """Fold the case of a text if case is ignored."""
+        return text.casefold() if self.ignore_case else text
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int) -> bool:
+        """Check that a match is not preceded or followed by a word
+        character."""
+        if start > 0 and _WORD_CHAR.match(text[start - 1]):
+            return False
+        if end < len(text) and _WORD_CHAR.match(text[end]):
+            return False
+        return True
+
+    def matches(self, text: str) -> bool:
+        """
+        Check whether a text contains any of the keywords.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            bool: True if any keyword occurs in the text, False otherwise.
+        """
+        if self._match_empty:
+            return True
+        text = self._normalize(text)
+        if self._pattern is not None:
+            return self._pattern.search(text) is not None
+        if self._automaton is None:
+            return False
+        for end, length in self._automaton.iter(text):
+            if (not self.whole_words or
+                    self._is_whole_word(text, end - length + 1, end + 1)):
+                return True
+        return False
+
+    def matches_any(self, *texts: str) -> bool:
+        """
+        Check whether any of the texts contains any of the keywords.
+
+        Args:
+            *texts (str): The texts to search.
+
+        Returns:
+            bool: True if any keyword occurs in any of the texts.
+        """
+        return any(self.matches(text) for text in texts)
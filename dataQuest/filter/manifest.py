@@ -0,0 +1,121 @@
+"""
+Manifest Module
+
+This module provides a writer and a reader for manifest files, which store
+the filtered articles as rows of a single CSV file instead of one JSON
+file per article.
+"""
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+from dataQuest.settings import ENCODING
+
+MANIFEST_FILE_NAME = "manifest.csv"
+MANIFEST_FIELDS = ["file_path", "article_id", "Date", "Title"]
+
+
+class ManifestWriter:
+    """
+    Append filtered articles to a manifest file in batches.
+
+    Rows are buffered in memory and written once batch_size rows are
+    collected, when flush() is called, or when the writer is closed.
+
+    Attributes:
+        path (Path): The path of the manifest file.
+        batch_size (int): The number of rows buffered before writing.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 10000,
+                 append: bool = False) -> None:
+        """
+        Initialize the ManifestWriter.
+
+        Args:
+            path (Path): The path of the manifest file.
+            batch_size (int): The number of rows buffered before writing.
+            append (bool): Append rows to an existing manifest file, e.g.
+            when resuming a run. Otherwise an existing file is removed.
+        """
+        if not append and path.exists():
+            path.unlink()
+        self.path = path
+        self.batch_size = batch_size
+        self._rows: List[Dict[str, str]] = []
+        self._file: Optional[TextIO] = None
+
+    def __enter__(self) -> "ManifestWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, data: Dict[str, str]) -> None:
+        """
+        Add a filtered article to the manifest.
+
+        Args:
+            data (Dict[str, str]): The article data, with the keys in
+            MANIFEST_FIELDS.
+        """
+        self._rows.append(data)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows: List[Dict[str, str]]) -> bool:
+        """
+        Add the filtered articles of an input file to the manifest.
+
+        The rows are written together, so a file is never written partly.
+
+        Args:
+            rows (List[Dict[str, str]]): The article data, with the keys in
+            MANIFEST_FIELDS.
+
+        Returns:
+            bool: True if the buffered rows were written.
+        """
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Write the buffered rows to the manifest file."""
+        if not self._rows:
+            return
+        if self._file is None:
+            write_header = (not self.path.exists()
+                            or self.path.stat().st_size == 0)
+            # pylint: disable=consider-using-with
+            self._file = open(self.path, "a", encoding=ENCODING, newline="")
+            if write_header:
+                csv.writer(self._file).writerow(MANIFEST_FIELDS)
+        writer = csv.DictWriter(self._file, fieldnames=MANIFEST_FIELDS,
+                                extrasaction="ignore")
+        writer.writerows(self._rows)
+        self._file.flush()
+        self._rows = []
+
+    def close(self) -> None:
+        """Write the buffered rows and close the manifest file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_manifest(path: Path) -> Iterator[Dict[str, str]]:
+    """
+    Read the filtered articles from a manifest file.
+
+    Args:
+        path (Path): The path of the manifest file.
+
+    Yields:
+        Dict[str, str]: The data of a filtered article, with the keys in
+        MANIFEST_FIELDS.
+    """
+    with open(path, "r", encoding=ENCODING, newline="") as manifest_file:
+        yield from csv.DictReader(manifest_file)
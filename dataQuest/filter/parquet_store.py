@@ -0,0 +1,285 @@
+"""
+Parquet Store Module
+
+This module writes issue files to a sharded Parquet dataset, and reads
+issues back from it.
+
+Every row of the dataset is an article, with the metadata of its issue and
+the path of the issue file it was converted from. The rows of an issue are
+stored together in one row group, so an issue is read from a single row
+group. Metadata and articles are read as separate column projections from
+memory-mapped shards, so documents that are rejected on their metadata are
+read without touching the article columns.
+"""
+import gzip
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataQuest.settings import ENCODING
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FILE_PATH_COLUMN = "file_path"
+TITLE_COLUMN = "title"
+DATE_COLUMN = "date"
+LANGUAGE_COLUMN = "language"
+ARTICLE_ID_COLUMN = "article_id"
+ARTICLE_TITLE_COLUMN = "article_title"
+ARTICLE_BODY_COLUMN = "article_body"
+METADATA_COLUMNS = (TITLE_COLUMN, DATE_COLUMN, LANGUAGE_COLUMN)
+ARTICLE_COLUMNS = (ARTICLE_ID_COLUMN, ARTICLE_TITLE_COLUMN,
+                   ARTICLE_BODY_COLUMN)
+SHARD_SUFFIX = ".parquet"
+
+METADATA_FIELD = "newsletter_metadata"
+ARTICLES_FIELD = "articles"
+
+IssueLocation = Tuple[str, int, int, int]
+"""The source file path, row group, offset and number of rows of an
+issue."""
+
+
+def _require_pyarrow() -> None:
+    """Raise an ImportError if pyarrow is not installed."""
+    if pq is None:
+        raise ImportError("The Parquet store requires the 'pyarrow' package;"
+                          " install it with 'pip install dataQuest[parquet]'")
+
+
+def store_schema() -> Any:
+    """
+    Get the schema of the shards of a Parquet store.
+
+    Returns:
+        pyarrow.Schema: The schema.
+    """
+    _require_pyarrow()
+    return pa.schema([
+        (FILE_PATH_COLUMN, pa.string()),
+        (TITLE_COLUMN, pa.string()),
+        (DATE_COLUMN, pa.string()),
+        (LANGUAGE_COLUMN, pa.string()),
+        (ARTICLE_ID_COLUMN, pa.string()),
+        (ARTICLE_TITLE_COLUMN, pa.string()),
+        (ARTICLE_BODY_COLUMN, pa.list_(pa.string())),
+    ])
+
+
+class ParquetStoreWriter:
+    """
+    Write issues to the shards of a Parquet store.
+
+    Issues are buffered until row_group_rows articles are collected, and
+    then written as one row group, so an issue is never split over row
+    groups or shards. A new shard is started once a shard holds shard_rows
+    articles.
+
+    Attributes:
+        output_dir (Path): The directory of the shards.
+        shard_rows (int): The number of articles after which a new shard
+        is started.
+        row_group_rows (int): The number of articles buffered before they
+        are written as a row group.
+        compression (str): The Parquet compression codec.
+    """
+
+    def __init__(self, output_dir: Path, shard_rows: int = 1000000,
+                 row_group_rows: int = 10000,
+                 compression: str = "zstd") -> None:
+        _require_pyarrow()
+        self.output_dir = output_dir
+        self.shard_rows = shard_rows
+        self.row_group_rows = row_group_rows
+        self.compression = compression
+        self._schema = store_schema()
+        self._columns: Dict[str, List[Any]] = {
+            name: [] for name in self._schema.names}
+        self._writer: Optional[Any] = None
+        self._shard = 0
+        self._shard_rows_written = 0
+
+    def __enter__(self) -> "ParquetStoreWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def shard_path(self, shard: int) -> Path:
+        """
+        Get the path of a shard.
+
+        Args:
+            shard (int): The number of the shard.
+
+        Returns:
+            Path: The path of the shard.
+        """
+        return self.output_dir / f"part-{shard:05d}{SHARD_SUFFIX}"
+
+    def add(self, file_path: str, issue: Dict[str, Any]) -> None:
+        """
+        Add an issue to the store.
+
+        Args:
+            file_path (str): The path of the issue file.
+            issue (Dict[str, Any]): The issue, with the metadata and
+            articles fields of an issue file.
+        """
+        metadata = issue[METADATA_FIELD]
+        for article_id, article in issue[ARTICLES_FIELD].items():
+            self._columns[FILE_PATH_COLUMN].append(file_path)
+            self._columns[TITLE_COLUMN].append(metadata.get("title"))
+            self._columns[DATE_COLUMN].append(metadata.get("date"))
+            self._columns[LANGUAGE_COLUMN].append(metadata.get("language"))
+            self._columns[ARTICLE_ID_COLUMN].append(str(article_id))
+            self._columns[ARTICLE_TITLE_COLUMN].append(article.get("title"))
+            self._columns[ARTICLE_BODY_COLUMN].append(article.get("body"))
+        if len(self._columns[FILE_PATH_COLUMN]) >= self.row_group_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered issues as a row group."""
+        rows = len(self._columns[FILE_PATH_COLUMN])
+        if rows == 0:
+            return
+        if self._writer is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.shard_path(self._shard),
+                                            self._schema,
+                                            compression=self.compression)
+        table = pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=rows)
+        self._columns = {name: [] for name in self._schema.names}
+        self._shard_rows_written += rows
+        if self._shard_rows_written >= self.shard_rows:
+            self._writer.close()
+            self._writer = None
+            self._shard += 1
+            self._shard_rows_written = 0
+
+    def close(self) -> None:
+        """Write the buffered issues and close the current shard."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def convert_to_parquet(input_files: Iterable[Path], output_dir: Path,
+                       shard_rows: int = 1000000,
+                       row_group_rows: int = 10000) -> Tuple[int, int]:
+    """
+    Convert issue files to a Parquet store.
+
+    Args:
+        input_files (Iterable[Path]): The '.json.gz' issue files, in the
+        layout read by KrantenFile.
+        output_dir (Path): The directory of the shards.
+        shard_rows (int): The number of articles per shard.
+        row_group_rows (int): The number of articles per row group.
+
+    Returns:
+        Tuple[int, int]: The number of converted issues and articles.
+    """
+    issues = 0
+    articles = 0
+    with ParquetStoreWriter(output_dir, shard_rows,
+                            row_group_rows) as writer:
+        for input_file in input_files:
+            with gzip.open(input_file, "rt", encoding=ENCODING) as f:
+                issue = json.load(f)
+            writer.add(str(input_file.resolve()), issue)
+            issues += 1
+            articles += len(issue[ARTICLES_FIELD])
+    return issues, articles
+
+
+def list_issues(shard_path: Path) -> List[IssueLocation]:
+    """
+    List the issues stored in a shard.
+
+    Only the file path column is read.
+
+    Args:
+        shard_path (Path): The path of the shard.
+
+    Returns:
+        List[IssueLocation]: The source file path, row group, offset and
+        number of rows of every issue, in the order of the shard.
+    """
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(shard_path, memory_map=True)
+    issues: List[IssueLocation] = []
+    for row_group in range(parquet_file.num_row_groups):
+        file_paths = parquet_file.read_row_group(
+            row_group, columns=[FILE_PATH_COLUMN]).column(0).to_pylist()
+        start = 0
+        for i in range(1, len(file_paths) + 1):
+            if i == len(file_paths) or file_paths[i] != file_paths[start]:
+                issues.append((file_paths[start], row_group, start,
+                               i - start))
+                start = i
+    return issues
+
+
+@lru_cache(maxsize=32)
+def _read_metadata_columns(shard_path: str, row_group: int) -> Any:
+    """Read the metadata columns of a row group, caching recently used
+    row groups."""
+    return pq.ParquetFile(shard_path, memory_map=True).read_row_group(
+        row_group, columns=list(METADATA_COLUMNS))
+
+
+@lru_cache(maxsize=2)
+def _read_article_columns(shard_path: str, row_group: int) -> Any:
+    """Read the article columns of a row group, caching the most recently
+    used row groups."""
+    return pq.ParquetFile(shard_path, memory_map=True).read_row_group(
+        row_group, columns=list(ARTICLE_COLUMNS))
+
+
+def read_issue_metadata(shard_path: Path, row_group: int,
+                        offset: int) -> Dict[str, Any]:
+    """
+    Read the metadata of an issue.
+
+    Args:
+        shard_path (Path): The path of the shard.
+        row_group (int): The row group of the issue.
+        offset (int): The first row of the issue in the row group.
+
+    Returns:
+        Dict[str, Any]: The title, date and language of the issue.
+    """
+    _require_pyarrow()
+    table = _read_metadata_columns(str(shard_path), row_group)
+    return {name: table.column(name)[offset].as_py()
+            for name in METADATA_COLUMNS}
+
+
+def read_issue_articles(shard_path: Path, row_group: int, offset: int,
+                        length: int) -> List[Tuple[str, str, List[str]]]:
+    """
+    Read the articles of an issue.
+
+    Args:
+        shard_path (Path): The path of the shard.
+        row_group (int): The row group of the issue.
+        offset (int): The first row of the issue in the row group.
+        length (int): The number of rows of the issue.
+
+    Returns:
+        List[Tuple[str, str, List[str]]]: The ID, title and body of every
+        article.
+    """
+    _require_pyarrow()
+    table = _read_article_columns(str(shard_path), row_group).slice(
+        offset, length)
+    return list(zip(*(table.column(name).to_pylist()
+                      for name in ARTICLE_COLUMNS)))
@@ -5,26 +5,200 @@ specified configurations.
 
 import argparse
 import logging
+from contextlib import ExitStack
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import pandas as pd
 from tqdm import tqdm
 
 from dataQuest.filter import INPUT_FILE_TYPES
+from dataQuest.filter.document_filter import DocumentFilter
+from dataQuest.filter.filter_compiler import compile_filter
+from dataQuest.filter.catalog import CorpusCatalog
+from dataQuest.filter.checkpoint import CheckpointJournal, config_fingerprint
 from dataQuest.filter.input_file import InputFile
+from dataQuest.filter.manifest import (ManifestWriter, MANIFEST_FILE_NAME,
+                                       read_manifest)
 from dataQuest.utils import load_filters_from_config
-from dataQuest.utils import save_filtered_articles
+from dataQuest.utils import get_filtered_article_data
+from dataQuest.utils import save_filtered_article_data
 from dataQuest.temporal_categorization import PERIOD_TYPES
+from dataQuest.temporal_categorization.period_writer import PeriodWriter
 from dataQuest.temporal_categorization.timestamped_data import TimestampedData
 from dataQuest.utils import get_keywords_from_config
 from dataQuest.utils import read_config
 from dataQuest.article_final_selection.process_articles import select_articles
+from dataQuest.article_final_selection.idf_model import load_or_fit_idf_model
 from dataQuest.generate_output import generate_output
 
 ARTICLE_SELECTOR_FIELD = "article_selector"
+EMBEDDER_FIELD = "embedder"
 OUTPUT_FILE_NAME = 'articles'
 FILENAME_COLUMN = 'file_path'
 ARTICLE_ID_COLUMN = 'article_id'
+MAX_FILES_PER_TASK = 64
+JSON_FORMAT = "json"
+MANIFEST_FORMAT = "manifest"
+FILTER_OUTPUT_FORMATS = [JSON_FORMAT, MANIFEST_FORMAT]
+
+_worker_filter: Optional[DocumentFilter] = None
+
+
+def filter_input_file(input_file: InputFile,
+                      compound_filter: DocumentFilter) -> List[Dict[str, str]]:
+    """
+    Filter the articles of a single input file.
+
+    Args:
+        input_file (InputFile): The input file to filter.
+        compound_filter (DocumentFilter): The filter to apply.
+
+    Returns:
+        List[Dict[str, str]]: The data of every selected article, in the
+        order in which the articles appear in the input file.
+    """
+    return [get_filtered_article_data(input_file, article.id)
+            for article in input_file.selected_articles(compound_filter)]
+
+
+def _init_filter_worker(config_path: Path) -> None:
+    """Load the filters once in every worker process."""
+    global _worker_filter  # pylint: disable=global-statement
+    _worker_filter = compile_filter(load_filters_from_config(config_path))
+
+
+def _filter_input_file_in_worker(input_file: InputFile) -> (
+        Tuple)[List[Dict[str, str]], int, int]:
+    """
+    Filter a single input file with the filters of the worker process.
+
+    Returns the data of the selected articles, and the numbers of parses
+    done and avoided by the document cache of the worker for this file.
+    """
+    if _worker_filter is None:
+        raise RuntimeError("Filter worker is not initialized.")
+    cache = InputFile.document_cache
+    misses, hits = cache.misses, cache.hits
+    articles_data = filter_input_file(input_file, _worker_filter)
+    return articles_data, cache.misses - misses, cache.hits - hits
+
+
+def iter_filtered_articles(
+    input_files: List[InputFile],
+    config_path: Path,
+    workers: int = 1,
+) -> Iterator[Tuple[InputFile, List[Dict[str, str]]]]:
+    """
+    Filter input files, optionally spread over a pool of processes.
+
+    Results are yielded in the order of input_files, regardless of the
+    number of workers, so the output of a run is deterministic. Once all
+    files are filtered, the parses done and avoided by the document caches
+    of the processes are logged.
+
+    Args:
+        input_files (List[InputFile]): The input files to filter.
+        config_path (Path): Path to the configuration file.
+        workers (int): Number of worker processes. With one worker the
+        files are filtered in the current process.
+
+    Yields:
+        Tuple[InputFile, List[Dict[str, str]]]: An input file and the data
+        of its selected articles.
+    """
+    if workers <= 1:
+        cache = InputFile.document_cache
+        misses, hits = cache.misses, cache.hits
+        compound_filter = compile_filter(load_filters_from_config(config_path))
+        for input_file in input_files:
+            yield input_file, filter_input_file(input_file, compound_filter)
+        logging.info("Document cache: %d parses, %d parses avoided",
+                     cache.misses - misses, cache.hits - hits)
+        return
+
+    chunksize = max(1, min(MAX_FILES_PER_TASK,
+                           len(input_files) // (workers * 4)))
+    parses = avoided_parses = 0
+    with Pool(workers, initializer=_init_filter_worker,
+              initargs=(config_path,)) as pool:
+        for input_file, (articles_data, file_parses, file_avoided_parses) \
+                in zip(input_files,
+                       pool.imap(_filter_input_file_in_worker, input_files,
+                                 chunksize=chunksize)):
+            parses += file_parses
+            avoided_parses += file_avoided_parses
+            yield input_file, articles_data
+    logging.info("Document cache of %d workers: %d parses, "
+                 "%d parses avoided", workers, parses, avoided_parses)
+
+
+def list_input_files(input_dir: Path, glob_pattern: str,
+                     input_type: str) -> List[InputFile]:
+    """
+    List the input files in a directory, sorted by path.
+
+    Args:
+        input_dir (Path): Directory containing input files.
+        glob_pattern (str): Glob pattern to match input files.
+        input_type (str): File format of the input files.
+
+    Returns:
+        List[InputFile]: The input files.
+    """
+    if not input_dir.is_dir():
+        raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
+
+    input_file_class = INPUT_FILE_TYPES[input_type]
+    return [input_file
+            for path in sorted(input_dir.rglob(glob_pattern))
+            for input_file in input_file_class.list_files(path)]
+
+
+def prune_input_files(input_files: List[InputFile], config_path: Path,
+                      catalog_path: Path) -> List[InputFile]:
+    """
+    Remove input files that the document-level filters reject on the
+    metadata in the catalog.
+
+    Args:
+        input_files (List[InputFile]): The input files.
+        config_path (Path): Path to the configuration file.
+        catalog_path (Path): Path of the catalog, see build_catalog.
+
+    Returns:
+        List[InputFile]: The input files that may contain selected
+        articles.
+    """
+    if not catalog_path.is_file():
+        raise ValueError(f"Catalog not found: '{str(catalog_path)}'")
+    compound_filter = compile_filter(load_filters_from_config(config_path))
+    with CorpusCatalog(catalog_path) as catalog:
+        selected = catalog.prune(input_files, compound_filter)
+    logging.info("Catalog selected %d of %d input files", len(selected),
+                 len(input_files))
+    return selected
+
+
+def skip_completed_files(input_files: List[InputFile],
+                         journal: CheckpointJournal) -> List[InputFile]:
+    """
+    Remove input files that a previous run completed and that did not
+    change since.
+
+    Args:
+        input_files (List[InputFile]): The input files.
+        journal (CheckpointJournal): The journal of the previous run.
+
+    Returns:
+        List[InputFile]: The input files that remain to be filtered.
+    """
+    remaining = [input_file for input_file in input_files
+                 if not journal.is_completed(input_file)]
+    if len(remaining) < len(input_files):
+        logging.info("Resuming: %d of %d input files were completed before",
+                     len(input_files) - len(remaining), len(input_files))
+    return remaining
 
 
 def filter_articles(
@@ -33,6 +207,10 @@ def filter_articles(
     config_path: Path,
     input_type: str,
     output_dir: Path,
+    workers: int = 1,
+    output_format: str = JSON_FORMAT,
+    catalog_path: Optional[Path] = None,
+    resume: bool = False,
 ):
     """
     Core functionality to process files, filter articles, and save results.
@@ -43,22 +221,133 @@ def filter_articles(
         config_path (Path): Path to the configuration file.
         input_type (str): File format of the input files.
         output_dir (Path): Directory to save filtered articles.
+        workers (int): Number of processes used to filter input files.
+        output_format (str): 'json' to save one JSON file per article, or
+        'manifest' to append all articles to a single manifest file.
+        catalog_path (Optional[Path]): Path of a catalog of the input files.
+        If given, input files rejected on their metadata are not opened.
+        resume (bool): Skip input files that an earlier run with the same
+        filters completed, according to its checkpoint journal in
+        output_dir, and that did not change since.
     """
-    if not input_dir.is_dir():
-        raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
+    if output_format not in FILTER_OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: '{output_format}'")
 
-    input_file_class = INPUT_FILE_TYPES[input_type]
-    input_files: Iterable[InputFile] = [
-        input_file_class(path) for path in input_dir.rglob(glob_pattern)
-    ]
+    input_files = list_input_files(input_dir, glob_pattern, input_type)
+    if catalog_path is not None:
+        input_files = prune_input_files(input_files, config_path,
+                                        catalog_path)
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    compound_filter = load_filters_from_config(config_path)
+    # The journal is closed after the manifest, so files are only recorded
+    # as completed once their articles are written.
+    with CheckpointJournal(output_dir,
+                           config_fingerprint(config_path, output_format),
+                           resume) as journal, ExitStack() as stack:
+        manifest: Optional[ManifestWriter] = None
+        if output_format == MANIFEST_FORMAT:
+            manifest = stack.enter_context(
+                ManifestWriter(output_dir / MANIFEST_FILE_NAME,
+                               append=journal.resumed))
+        input_files = skip_completed_files(input_files, journal)
+        for input_file, articles_data in tqdm(
+                iter_filtered_articles(input_files, config_path, workers),
+                total=len(input_files), desc="Filtering articles",
+                unit="file"):
+            journal.mark_completed(input_file)
+            if manifest is not None:
+                if manifest.write_many(articles_data):
+                    journal.commit()
+                continue
+            for article_data in articles_data:
+                save_filtered_article_data(article_data,
+                                           input_file.base_file_name(),
+                                           output_dir)
+            journal.commit()
+
+
+def remove_period_files(output_dir: Path) -> None:
+    """
+    Remove the period files written to a directory by an earlier run.
+
+    Args:
+        output_dir (Path): Directory of the period files.
+    """
+    for period_file in output_dir.glob(f"{OUTPUT_FILE_NAME}_*.csv"):
+        period_file.unlink()
+
+
+def filter_and_categorize_articles(
+    input_dir: Path,
+    glob_pattern: str,
+    config_path: Path,
+    input_type: str,
+    period_type: str,
+    output_dir: Path,
+    workers: int = 1,
+    max_buffered_rows: int = 100000,
+    catalog_path: Optional[Path] = None,
+    resume: bool = False,
+):
+    """
+    Filter articles and categorize them by timestamp in one pass.
+
+    The time period of each selected article is derived from the publish
+    date of its document, so no intermediate files are written. The
+    period files contain the same articles as those of filter_articles
+    followed by categorize_articles, although not necessarily in the same
+    order. Period files of an earlier run are replaced, unless the run is
+    resumed.
+
+    Args:
+        input_dir (Path): Directory containing input files.
+        glob_pattern (str): Glob pattern to match input files.
+        config_path (Path): Path to the configuration file.
+        input_type (str): File format of the input files.
+        period_type (str): Type of time period to use for categorization.
+        output_dir (Path): Directory to save categorized files.
+        workers (int): Number of processes used to filter input files.
+        max_buffered_rows (int): Number of articles kept in memory before
+        they are appended to the period files.
+        catalog_path (Optional[Path]): Path of a catalog of the input files.
+        If given, input files rejected on their metadata are not opened.
+        resume (bool): Skip input files that an earlier run with the same
+        filters completed, according to its checkpoint journal in
+        output_dir, and that did not change since.
+    """
+    input_files = list_input_files(input_dir, glob_pattern, input_type)
+    if catalog_path is not None:
+        input_files = prune_input_files(input_files, config_path,
+                                        catalog_path)
+    time_period_class = PERIOD_TYPES[period_type]
+
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    for input_file in tqdm(input_files, desc="Filtering articles", unit="file"):
-        for article in input_file.selected_articles(compound_filter):
-            save_filtered_articles(input_file, article.id, output_dir)
+    with CheckpointJournal(output_dir,
+                           config_fingerprint(config_path, period_type),
+                           resume) as journal:
+        if not journal.resumed:
+            remove_period_files(output_dir)
+        with PeriodWriter(output_dir, OUTPUT_FILE_NAME,
+                          [FILENAME_COLUMN, ARTICLE_ID_COLUMN],
+                          max_buffered_rows) as period_writer:
+            input_files = skip_completed_files(input_files, journal)
+            for input_file, articles_data in tqdm(
+                    iter_filtered_articles(input_files, config_path, workers),
+                    total=len(input_files), desc="Filtering articles",
+                    unit="file"):
+                journal.mark_completed(input_file)
+                if not articles_data:
+                    continue
+                try:
+                    period = time_period_class(data=articles_data[0]).categorize()
+                except ValueError as e:
+                    logging.error("Error processing timestamped object: %s",
+                                  str(e))
+                    continue
+                if period_writer.add_many(period, articles_data):
+                    journal.commit()
 
 
 def categorize_articles(
@@ -66,6 +355,9 @@ def categorize_articles(
     period_type: str,
     glob_pattern: str,
     output_dir: Path,
+    input_format: str = JSON_FORMAT,
+    max_buffered_rows: int = 100000,
+    overwrite: bool = False,
 ):
     """
     Core functionality to categorize articles by timestamp.
@@ -75,42 +367,49 @@ def categorize_articles(
         period_type (str): Type of time period to use for categorization.
         glob_pattern (str): Glob pattern to find input files (e.g., '*.json').
         output_dir (Path): Directory to save categorized files.
+        input_format (str): 'json' if the input files are JSON files of
+        single articles, or 'manifest' if they are manifest files.
+        max_buffered_rows (int): Number of articles kept in memory before
+        they are appended to the period files.
+        overwrite (bool): Remove existing period files instead of
+        appending to them.
     """
     if not input_dir.is_dir():
         raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
 
     time_period_class = PERIOD_TYPES[period_type]
-    timestamped_objects: Iterable[TimestampedData] = [
-        time_period_class(path) for path in input_dir.rglob(glob_pattern)
-    ]
+    timestamped_objects: Iterable[TimestampedData]
+    if input_format == MANIFEST_FORMAT:
+        timestamped_objects = (
+            time_period_class(data=row)
+            for path in sorted(input_dir.rglob(glob_pattern))
+            for row in read_manifest(path)
+        )
+    else:
+        timestamped_objects = (
+            time_period_class(path) for path in input_dir.rglob(glob_pattern)
+        )
 
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    for timestamped_object in tqdm(timestamped_objects,
-                                   desc="Categorize by timestamp",
-                                   unit="file"):
-        try:
-            timestamp = timestamped_object.categorize()
-            timestamp_file_name = output_dir / f"{OUTPUT_FILE_NAME}_{timestamp}.csv"
-
-            expected_columns = [FILENAME_COLUMN, ARTICLE_ID_COLUMN]
-
-            if timestamp_file_name.exists():
-                df = pd.read_csv(timestamp_file_name)
-            else:
-                df = pd.DataFrame(columns=expected_columns)
-
-            new_row = {
-                FILENAME_COLUMN: str(timestamped_object.data().get(FILENAME_COLUMN, "")),
-                ARTICLE_ID_COLUMN: str(timestamped_object.data().get(ARTICLE_ID_COLUMN, ""))
-            }
-            df = pd.concat([df, pd.DataFrame([new_row], columns=expected_columns)],
-                           ignore_index=True)
-
-            df.to_csv(timestamp_file_name, index=False)
-
-        except Exception as e:  # pylint: disable=broad-except
-            logging.error("Error processing timestamped object: %s", str(e))
+    if overwrite:
+        remove_period_files(output_dir)
+
+    with PeriodWriter(output_dir, OUTPUT_FILE_NAME,
+                      [FILENAME_COLUMN, ARTICLE_ID_COLUMN],
+                      max_buffered_rows) as period_writer:
+        for timestamped_object in tqdm(timestamped_objects,
+                                       desc="Categorize by timestamp",
+                                       unit="file"):
+            try:
+                period_writer.add(timestamped_object.categorize(), {
+                    FILENAME_COLUMN: str(timestamped_object.data().get(
+                        FILENAME_COLUMN, "")),
+                    ARTICLE_ID_COLUMN: str(timestamped_object.data().get(
+                        ARTICLE_ID_COLUMN, ""))
+                })
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error("Error processing timestamped object: %s",
+                              str(e))
 
 
 def update_selected_indices_in_file(filepath: str,
@@ -146,6 +445,8 @@ def select_final_articles(
     input_dir: Path,
     glob_pattern: str,
     config_path: Path,
+    idf_model_path: Optional[Path] = None,
+    idf_sample_size: Optional[int] = None,
 ):
     """
     Core functionality to select final articles based on keywords and configuration.
@@ -154,14 +455,29 @@ def select_final_articles(
         input_dir (Path): Directory containing input files.
         glob_pattern (str): Glob pattern to match input files (e.g., '*.csv').
         config_path (Path): Path to the configuration file.
+        idf_model_path (Optional[Path]): File path of an IDF model fitted on
+        the articles of all input files. The model is fitted and saved if
+        the file does not exist, and articles are only transformed by it.
+        If None, a model is fitted on every input file.
+        idf_sample_size (Optional[int]): The number of articles sampled to
+        fit the IDF model on; all articles are used if None.
     """
     if not input_dir.is_dir():
         raise ValueError(f"Not a directory: '{str(input_dir.absolute())}'")
 
     keywords = get_keywords_from_config(config_path)
     config_article_selector = read_config(config_path, ARTICLE_SELECTOR_FIELD)
+    try:
+        config_embedder = read_config(config_path, EMBEDDER_FIELD)
+    except KeyError:
+        config_embedder = {}
 
     if len(keywords) > 0 and config_article_selector:
+        model = None
+        if idf_model_path is not None:
+            model = load_or_fit_idf_model(input_dir, glob_pattern,
+                                          config_path, idf_model_path,
+                                          config_embedder, idf_sample_size)
         for articles_filepath in tqdm(
             input_dir.rglob(glob_pattern),
             desc="Processing articles",
@@ -169,7 +485,8 @@ def select_final_articles(
         ):
             try:
                 selected_indices = select_articles(
-                    str(articles_filepath), keywords, config_article_selector
+                    str(articles_filepath), keywords, config_article_selector,
+                    config_embedder, model
                 )
 
                 update_selected_indices_in_file(str(articles_filepath), selected_indices)
@@ -219,27 +536,96 @@ def cli():
         choices=list(PERIOD_TYPES.keys()),
         help="Time periods",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to filter input files.",
+    )
+    parser.add_argument(
+        "--filter-output",
+        type=str,
+        default=JSON_FORMAT,
+        choices=FILTER_OUTPUT_FORMATS,
+        help="Store filtered articles as one JSON file per article, or "
+             "in batches in a single manifest file.",
+    )
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="Categorize filtered articles by timestamp while filtering, "
+             "without writing intermediate files.",
+    )
+    parser.add_argument(
+        "--catalog-path",
+        type=Path,
+        help="File path of a catalog of the input files, created with "
+             "build-catalog. Input files rejected on their metadata are "
+             "not opened.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip input files that an interrupted run with the same "
+             "filters completed and that did not change since.",
+    )
+    parser.add_argument(
+        "--idf-model",
+        type=Path,
+        help="File path of an IDF model fitted once on the filtered "
+             "articles of all periods, and reused by later runs with the "
+             "same configuration. By default, a model is fitted per period.",
+    )
+    parser.add_argument(
+        "--idf-sample",
+        type=int,
+        help="Number of randomly sampled articles the IDF model is fitted "
+             "on; all articles are used by default.",
+    )
     args = parser.parse_args()
 
     try:
-        filter_articles(
-            input_dir=args.input_dir,
-            glob_pattern=args.glob,
-            config_path=args.config_path,
-            input_type=args.input_type,
-            output_dir=args.output_dir / "output_filter",
-        )
-        categorize_articles(
-            input_dir=args.output_dir / "output_filter",
-            period_type=args.period_type,
-            glob_pattern="*.json",
-            output_dir=args.output_dir / "output_timestamped",
-        )
+        if args.fused:
+            filter_and_categorize_articles(
+                input_dir=args.input_dir,
+                glob_pattern=args.glob,
+                config_path=args.config_path,
+                input_type=args.input_type,
+                period_type=args.period_type,
+                output_dir=args.output_dir / "output_timestamped",
+                workers=args.workers,
+                catalog_path=args.catalog_path,
+                resume=args.resume,
+            )
+        else:
+            filter_articles(
+                input_dir=args.input_dir,
+                glob_pattern=args.glob,
+                config_path=args.config_path,
+                input_type=args.input_type,
+                output_dir=args.output_dir / "output_filter",
+                workers=args.workers,
+                output_format=args.filter_output,
+                catalog_path=args.catalog_path,
+                resume=args.resume,
+            )
+            categorize_articles(
+                input_dir=args.output_dir / "output_filter",
+                period_type=args.period_type,
+                glob_pattern=(MANIFEST_FILE_NAME
+                              if args.filter_output == MANIFEST_FORMAT
+                              else "*.json"),
+                output_dir=args.output_dir / "output_timestamped",
+                input_format=args.filter_output,
+                overwrite=args.resume,
+            )
 
         select_final_articles(
             input_dir=args.output_dir / "output_timestamped",
             glob_pattern="*.csv",
             config_path=args.config_path,
+            idf_model_path=args.idf_model,
+            idf_sample_size=args.idf_sample,
         )
 
         generate_output(
@@ -2,12 +2,13 @@
 and saves their text for manual labeling"""
 import logging
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 import pandas as pd
 from pandas import DataFrame
 from spacy.language import Language
 from dataQuest.settings import SPACY_MODEL
-from dataQuest.article_final_selection.process_article import ArticleProcessor
+from dataQuest.article_final_selection.process_article import (
+    ArticleContent, ArticleProcessor, read_articles_from_gzip)
 from dataQuest.utils import read_config, get_file_name_without_extension
 from dataQuest.output_generator.text_formater import (TextFormatter,
                                                       SEGMENTED_TEXT_FORMATTER)
@@ -26,7 +27,8 @@ MIN_TEXT_CHARS = "min_text_chars"
 SENTENCE_PER_SEGMENT_KEY = "sentences_per_segment"
 
 
-def read_article(row: pd.Series, formatter: TextFormatter) -> DataFrame:
+def read_article(row: pd.Series, formatter: TextFormatter,
+                 content: Optional[ArticleContent] = None) -> DataFrame:
     """
     Read article from row and return DataFrame of articles.
 
@@ -34,13 +36,15 @@ def read_article(row: pd.Series, formatter: TextFormatter) -> DataFrame:
         row (pd.Series): A row from a DataFrame.
         formatter (TextFormatter): An object of TextFormatter to format
         output text. Defaults to False.
+        content (Optional[ArticleContent]): The title, body and date of the
+        article, if they are already read.
 
     Returns:
         DataFrame: DataFrame containing article information.
     """
     file_path = row[FILE_PATH_FIELD]
     article_id = row[ARTICLE_ID_FIELD]
-    article_processor = ArticleProcessor(file_path, article_id)
+    article_processor = ArticleProcessor(file_path, article_id, content)
     title, body, date = article_processor.read_article_from_gzip()
 
     body_formatted = formatter.format_output(body)
@@ -73,6 +77,9 @@ def find_articles_in_file(filepath: str, formatter: TextFormatter) -> (
     """
     Find selected articles in a CSV file and return DataFrame of articles.
 
+    Selected articles are read grouped by input file, so every input file
+    is read once.
+
     Args:
         filepath (str): Path to the CSV file.
         formatter (TextFormatter): An object of TextFormatter to format
@@ -85,7 +92,20 @@ def find_articles_in_file(filepath: str, formatter: TextFormatter) -> (
         df_articles = pd.read_csv(filepath)
         df_selected = df_articles.loc[df_articles[SELECTED_FIELD] == 1]
 
-        result = pd.concat([read_article(row, formatter)
+        contents = {
+            file_path: read_articles_from_gzip(str(file_path),
+                                               group[ARTICLE_ID_FIELD])
+            for file_path, group in df_selected.groupby(FILE_PATH_FIELD,
+                                                        sort=False,
+                                                        dropna=False)
+        }
+        # Rows without a file path, whose NaN key is not found again, are
+        # read as missing articles, like rows of files that cannot be read.
+        result = pd.concat([read_article(
+                                row, formatter,
+                                contents.get(row[FILE_PATH_FIELD], {}).get(
+                                    str(row[ARTICLE_ID_FIELD]),
+                                    (None, None, None)))
                             for _, row in df_selected.iterrows()],
                            axis=0, ignore_index=True)
         return result
@@ -0,0 +1,9 @@
+"""define embedder type"""
+from dataQuest.models.tfidf import TfidfEmbedder
+from dataQuest.models.hashing import HashingEmbedder
+
+EMBEDDER_TYPES = {
+    "tfidf": TfidfEmbedder,
+    "hashing": HashingEmbedder
+}
+"""Mapping from embedder types in the config file to embedder classes."""
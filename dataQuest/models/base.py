@@ -1,7 +1,7 @@
 """Base class for document embeddings."""
 
 from abc import ABC, abstractmethod
-from typing import Union, Sequence
+from typing import Any, Dict, Iterable, Union, Sequence
 import scipy
 from numpy import typing as npt
 import numpy as np
@@ -14,7 +14,29 @@ class BaseEmbedder(ABC):
     def fit(self, documents: Sequence[str]) -> None:
         """Train the model on documents."""
 
+    def fit_batches(self, batches: Iterable[Sequence[str]]) -> None:
+        """Train the model on documents read in batches.
+
+        Embedders that cannot be trained batch by batch are trained on all
+        documents at once."""
+        self.fit([document for batch in batches for document in batch])
+
     @abstractmethod
     def transform(self, documents: Union[str, Sequence[str]]) -> (
             Union)[scipy.sparse.spmatrix, npt.NDArray[np.float_]]:
         """Get the embedding for a document."""
+
+    @abstractmethod
+    def get_idf_state(self) -> Dict[str, Any]:
+        """Get the fitted state of the model, e.g. its vocabulary and IDF,
+        as JSON-serializable values."""
+
+    @abstractmethod
+    def set_idf_state(self, state: Dict[str, Any]) -> None:
+        """Restore the fitted state returned by get_idf_state."""
+
+    def fit_transform(self, documents: Sequence[str]) -> (
+            Union)[scipy.sparse.spmatrix, npt.NDArray[np.float_]]:
+        """Train the model on documents and get their embeddings."""
+        self.fit(documents)
+        return self.transform(documents)
@@ -0,0 +1,206 @@
+"""Sklearn hashing TF-IDF class."""
+
+from typing import Any, Dict, Iterable, Sequence, Union, Optional
+import warnings
+
+import numpy as np
+import scipy
+from spacy.language import Language
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from dataQuest.settings import SPACY_MODEL
+from dataQuest.models.base import BaseEmbedder
+from dataQuest.utils import initialize_nlp
+from dataQuest.preprocessor.annotation_cache import parse
+
+
+class HashingEmbedder(BaseEmbedder):
+    # pylint: disable=too-many-instance-attributes
+    """
+       TF-IDF embeddings of hashed terms.
+
+       Terms are mapped to a fixed number of columns by
+       sklearn's HashingVectorizer, so no vocabulary is built and the memory
+       of the model does not grow with the number of distinct terms, e.g.
+       OCR errors. The term frequencies are re-weighted by the smoothed IDF
+       of the documents the model is fitted on, as by TfidfEmbedder. Columns
+       of terms that do not occur in these documents get an IDF of 0, like
+       terms that are not in the vocabulary of TfidfEmbedder, so apart from
+       hash collisions both embedders give the same similarities.
+
+       Arguments
+       ---------
+       n_features:
+           Number of columns of the embeddings.
+       ngram_max:
+           Maximum n-gram, higher numbers mean more hash collisions.
+       norm:
+           Which kind of normalization is used: "l1", "l2" or None.
+       sublinear_tf:
+           Apply sublinear term-frequency scaling.
+       pretokenized:
+           Documents are already tokenized and lemmatized, e.g. by
+           TextCleaner.preprocess, with tokens separated by whitespace. The
+           documents are split on whitespace instead of being processed by
+           the SpaCy model again.
+       """
+
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+            self, n_features: int = 2 ** 20, ngram_max: int = 1,
+            norm: Optional[str] = "l1", sublinear_tf: bool = False,
+            spacy_model: Union[str, Language] = SPACY_MODEL,
+            pretokenized: bool = False) -> None:
+
+        self.nlp: Language = initialize_nlp(spacy_model)
+        if not callable(self.nlp):
+            raise ValueError("Failed to initialize SpaCy NLP pipeline.")
+
+        self.stop_words = list(self.nlp.Defaults.stop_words)
+        self.n_features = int(n_features)
+        self.ngram_max = ngram_max
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.pretokenized = pretokenized
+        if self.norm == "None":
+            self.norm = None
+
+        self._vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=(1, self.ngram_max),
+            stop_words=self.stop_words,
+            tokenizer=str.split if self.pretokenized else self._tokenizer,
+            alternate_sign=False,
+            norm=None)
+        self._idf: Optional[np.ndarray] = None
+
+    def _tokenizer(self, text: str):
+        doc = parse(self.nlp, text)
+        return [token.lemma_.lower() for token in doc
+                if not token.is_stop and not token.is_punct]
+
+    def _count(self, documents: Union[str, Sequence[str]]) -> (
+            scipy.sparse.csr_matrix):
+        """Get the term frequencies of documents in the hashed columns."""
+        if isinstance(documents, str):
+            documents = [documents]
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            return self._vectorizer.transform(documents).tocsr()
+
+    def fit(self, documents: Sequence[str]) -> None:
+        """
+        Fit the IDF of the hashed columns on the given documents.
+
+        Args:
+            documents (Sequence[str]): A sequence of document strings.
+        """
+        counts = self._count(documents)
+        self._set_idf(self._document_frequencies(counts), counts.shape[0])
+
+    def fit_batches(self, batches: Iterable[Sequence[str]]) -> None:
+        """
+        Fit the IDF of the hashed columns on documents read in batches.
+
+        Only one batch of documents is in memory at a time; the IDF is the
+        same as that of fit on all documents.
+
+        Args:
+            batches (Iterable[Sequence[str]]): Batches of document strings.
+        """
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n_documents = 0
+        for batch in batches:
+            counts = self._count(batch)
+            df += self._document_frequencies(counts)
+            n_documents += counts.shape[0]
+        self._set_idf(df, n_documents)
+
+    def _document_frequencies(self, counts: scipy.sparse.csr_matrix) -> (
+            np.ndarray):
+        """Get the number of documents in which every column occurs."""
+        return np.bincount(counts.indices, minlength=self.n_features)
+
+    def _set_idf(self, df: np.ndarray, n_documents: int) -> None:
+        """Set the smoothed IDF, which is 0 for columns that do not occur."""
+        if n_documents == 0:
+            raise ValueError("The documents list cannot be empty.")
+        idf = np.log((n_documents + 1) / (df + 1)) + 1.0
+        idf[df == 0] = 0.0
+        self._idf = idf
+
+    def get_idf_state(self) -> Dict[str, Any]:
+        """
+        Get the IDF of the fitted model.
+
+        Returns:
+            Dict[str, Any]: The number of columns, and the columns that
+            occur in the fitted documents with their IDF.
+        """
+        if self._idf is None:
+            raise ValueError("Fit hashing model before saving it.")
+        columns = np.flatnonzero(self._idf)
+        return {"n_features": self.n_features, "columns": columns.tolist(),
+                "idf": self._idf[columns].tolist()}
+
+    def set_idf_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the IDF returned by get_idf_state.
+
+        Args:
+            state (Dict[str, Any]): The state of a fitted model.
+        """
+        if state["n_features"] != self.n_features:
+            raise ValueError(f"The model has {state['n_features']} columns, "
+                             f"not {self.n_features}.")
+        idf = np.zeros(self.n_features)
+        idf[np.asarray(state["columns"], dtype=np.int64)] = state["idf"]
+        self._idf = idf
+
+    def _weight(self, counts: scipy.sparse.csr_matrix) -> (
+            scipy.sparse.csr_matrix):
+        """Re-weight term frequencies by the IDF and normalize them."""
+        assert self._idf is not None
+        if self.sublinear_tf:
+            np.log(counts.data, counts.data)
+            counts.data += 1.0
+        counts.data *= self._idf[counts.indices]
+        counts.eliminate_zeros()
+        if self.norm is not None:
+            counts = normalize(counts, norm=self.norm, copy=False)
+        return counts
+
+    def fit_transform(self, documents: Sequence[str]) -> Union[
+            scipy.sparse.spmatrix]:
+        """
+        Fit the IDF on the given documents and transform them into
+        embeddings, hashing every document once.
+
+        Args:
+            documents (Sequence[str]): A sequence of document strings.
+
+        Returns:
+            Union[scipy.sparse.spmatrix]: The embeddings of the documents.
+        """
+        counts = self._count(documents)
+        self._set_idf(self._document_frequencies(counts), counts.shape[0])
+        return self._weight(counts)
+
+    def transform(self, documents: Union[str, Sequence[str]]) -> Union[
+            scipy.sparse.spmatrix]:
+        """
+        Transform the input documents into embeddings.
+
+        Args:
+            documents (Union[str, Sequence[str]]): A single document string or
+            a sequence of document strings.
+
+        Returns:
+            Union[scipy.sparse.spmatrix]: The embeddings of the input
+             documents.
+        """
+        if self._idf is None:
+            raise ValueError("Fit hashing model before transforming data.")
+        return self._weight(self._count(documents))
@@ -1,8 +1,11 @@
 """Sklearn TF-IDF class."""
 
-from typing import Sequence, Union, Optional
+from collections import Counter
+from numbers import Integral
+from typing import Any, Dict, Iterable, Sequence, Union, Optional
 import warnings
 
+import numpy as np
 import scipy
 from spacy.language import Language
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -10,6 +13,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from dataQuest.settings import SPACY_MODEL
 from dataQuest.models.base import BaseEmbedder
 from dataQuest.utils import initialize_nlp
+from dataQuest.preprocessor.annotation_cache import parse
 
 
 class TfidfEmbedder(BaseEmbedder):
@@ -29,6 +33,11 @@ class TfidfEmbedder(BaseEmbedder):
            Minimum document frequency of word to be included in the embedding.
        max_df:
            Maximum document frequency of word to be included in the embedding.
+       pretokenized:
+           Documents are already tokenized and lemmatized, e.g. by
+           TextCleaner.preprocess, with tokens separated by whitespace. The
+           documents are split on whitespace instead of being processed by
+           the SpaCy model again.
        """
 
     # pylint: disable=too-many-arguments
@@ -36,7 +45,8 @@ class TfidfEmbedder(BaseEmbedder):
     def __init__(
             self, ngram_max: int = 1, norm: Optional[str] = "l1",
             sublinear_tf: bool = False, min_df: int = 1,
-            max_df: float = 1.0, spacy_model: Union[str, Language] = SPACY_MODEL) -> None:
+            max_df: float = 1.0, spacy_model: Union[str, Language] = SPACY_MODEL,
+            pretokenized: bool = False) -> None:
 
         self.nlp: Language = initialize_nlp(spacy_model)
         if not callable(self.nlp):
@@ -50,42 +60,152 @@ class TfidfEmbedder(BaseEmbedder):
         self.sublinear_tf = sublinear_tf
         self.min_df = min_df
         self.max_df = max_df
+        self.pretokenized = pretokenized
         if self.norm == "None":
             self.norm = None
 
         self._model: Optional[TfidfVectorizer] = None
 
-    def fit(self, documents: Sequence[str]) -> None:
+    def _create_model(self, n_documents: int,
+                      vocabulary: Optional[Dict[str, int]] = None) -> (
+            TfidfVectorizer):
         """
-        Fit the TF-IDF model on the given documents.
+        Create the TF-IDF vectorizer for the given number of documents.
 
         Args:
-            documents (Sequence[str]): A sequence of document strings.
+            n_documents (int): The number of documents the model is fitted
+            on.
+            vocabulary (Optional[Dict[str, int]]): A fixed vocabulary, which
+            maps terms to columns.
         """
-        if len(documents) == 0:
+        if n_documents == 0:
             raise ValueError("The documents list cannot be empty.")
 
-        min_df = min(self.min_df, len(documents))
-        max_df = max(min_df / len(documents) if len(documents) > 0 else 1, self.max_df)
+        min_df = min(self.min_df, n_documents)
+        max_df = max(min_df / n_documents, self.max_df)
 
         def _tokenizer(text):
-            doc = self.nlp(text)
+            doc = parse(self.nlp, text)
             tokens = [token.lemma_.lower() for token in doc
                       if not token.is_stop and not token.is_punct]
             return tokens
 
+        return TfidfVectorizer(
+            ngram_range=(1, self.ngram_max),
+            stop_words=self.stop_words,
+            tokenizer=str.split if self.pretokenized else _tokenizer,
+            min_df=min_df,
+            norm=self.norm,
+            sublinear_tf=self.sublinear_tf,
+            max_df=max_df,
+            vocabulary=vocabulary)
+
+    def fit(self, documents: Sequence[str]) -> None:
+        """
+        Fit the TF-IDF model on the given documents.
+
+        Args:
+            documents (Sequence[str]): A sequence of document strings.
+        """
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            self._model = TfidfVectorizer(
-                ngram_range=(1, self.ngram_max),
-                stop_words=self.stop_words,
-                tokenizer=_tokenizer,  # self.stem_tokenizer,
-                min_df=min_df,
-                norm=self.norm,
-                sublinear_tf=self.sublinear_tf,
-                max_df=max_df)
+            self._model = self._create_model(len(documents))
             self._model.fit(documents)
 
+    def fit_batches(self, batches: Iterable[Sequence[str]]) -> None:
+        """
+        Fit the TF-IDF model on documents read in batches.
+
+        The document frequencies of the terms are counted batch by batch, so
+        only one batch of documents is in memory at a time. The vocabulary,
+        after applying min_df and max_df, and the IDF are the same as those
+        of fit on all documents.
+
+        Args:
+            batches (Iterable[Sequence[str]]): Batches of document strings.
+        """
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            analyzer = self._create_model(1).build_analyzer()
+            document_frequencies: Counter = Counter()
+            n_documents = 0
+            for batch in batches:
+                for document in batch:
+                    document_frequencies.update(set(analyzer(document)))
+                n_documents += len(batch)
+
+            model = self._create_model(n_documents)
+            if not document_frequencies:
+                raise ValueError("empty vocabulary; perhaps the documents only"
+                                 " contain stop words")
+            max_count = float(model.max_df) if isinstance(
+                model.max_df, Integral) else model.max_df * n_documents
+            min_count = float(model.min_df) if isinstance(
+                model.min_df, Integral) else model.min_df * n_documents
+            if max_count < min_count:
+                raise ValueError(
+                    "max_df corresponds to < documents than min_df")
+            terms = sorted(term for term, count in document_frequencies.items()
+                           if min_count <= count <= max_count)
+            if not terms:
+                raise ValueError("After pruning, no terms remain. Try a lower"
+                                 " min_df or a higher max_df.")
+
+            model = self._create_model(
+                n_documents, {term: i for i, term in enumerate(terms)})
+            df = np.array([document_frequencies[term] for term in terms],
+                          dtype=np.float64)
+            model.idf_ = np.log((n_documents + 1) / (df + 1)) + 1.0
+            self._model = model
+
+    def get_idf_state(self) -> Dict[str, Any]:
+        """
+        Get the vocabulary and IDF of the fitted model.
+
+        Returns:
+            Dict[str, Any]: The terms of the vocabulary, in the order of
+            the columns, and the IDF of every column.
+        """
+        if self._model is None:
+            raise ValueError("Fit TF-IDF model before saving it.")
+        vocabulary = self._model.vocabulary_
+        return {"vocabulary": sorted(vocabulary, key=vocabulary.get),
+                "idf": self._model.idf_.tolist()}
+
+    def set_idf_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the vocabulary and IDF returned by get_idf_state.
+
+        Args:
+            state (Dict[str, Any]): The state of a fitted model.
+        """
+        terms = state["vocabulary"]
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            # min_df and max_df do not apply to a fixed vocabulary.
+            model = self._create_model(
+                1, {term: i for i, term in enumerate(terms)})
+            model.idf_ = np.asarray(state["idf"], dtype=np.float64)
+        self._model = model
+
+    def fit_transform(self, documents: Sequence[str]) -> Union[
+            scipy.sparse.spmatrix]:
+        """
+        Fit the TF-IDF model on the given documents and transform them into
+        TF-IDF embeddings, tokenizing every document once.
+
+        Args:
+            documents (Sequence[str]): A sequence of document strings.
+
+        Returns:
+            Union[scipy.sparse.spmatrix]: The TF-IDF embeddings of the
+             documents.
+        """
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self._model = self._create_model(len(documents))
+            return self._model.fit_transform(documents).tocsr()
+
     def transform(self, documents: Union[str, Sequence[str]]) -> Union[
             scipy.sparse.spmatrix]:
         """
@@ -4,6 +4,7 @@ from typing import List, Union
 import logging
 from spacy.language import Language
 from dataQuest.utils import initialize_nlp
+from dataQuest.preprocessor.annotation_cache import parse
 
 PARAGRAPH_FORMATTER = 'paragraph'
 FULLTEXT_FORMATTER = 'full_text'
@@ -101,7 +102,7 @@ class TextFormatter:
 
         segmented_texts = []
         for text in self.texts:
-            doc = self.nlp(text)
+            doc = parse(self.nlp, text)
             sentences = [sent.text for sent in doc.sents]
 
             for i in range(0, len(sentences), self.sentences_per_segment):
@@ -0,0 +1,367 @@
+"""
+This module provides an on-disk cache of SpaCy annotations, so the same
+text is processed by a SpaCy pipeline only once, across components and runs.
+"""
+import atexit
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+from dataQuest.settings import (ANNOTATION_CACHE_DIR,
+                                ANNOTATION_CACHE_MAX_BYTES,
+                                NLP_BATCH_SIZE, NLP_PROCESSES, ENCODING)
+
+SHARD_SUFFIX = ".spacy"
+INDEX_FILE_NAME = "index.db"
+ENTRIES_TABLE = "entries"
+SHARDS_TABLE = "shards"
+SHARD_TEXT_CHARS = 4 * 1024 ** 2
+"""Number of characters of text whose annotations are stored per shard."""
+LOADED_SHARDS = 2
+"""Number of shards whose documents are kept in memory."""
+
+
+class AnnotationCache:
+    # pylint: disable=too-many-instance-attributes
+    """
+    Cache of processed texts, stored in DocBin shards.
+
+    Entries are keyed by the text and by the name, version and components
+    of the SpaCy pipeline, so a changed model never returns stale
+    annotations. The stored documents hold tokens, lemmas and sentence
+    boundaries; lexical flags such as is_stop and is_punct are restored
+    from the vocabulary of the pipeline.
+
+    New entries are buffered and written together as a shard, a single
+    DocBin file, once their texts reach SHARD_TEXT_CHARS characters or when
+    the cache is closed. A SQLite index maps the hash of every text to its
+    shard and position in the shard, and records the size of every shard
+    and when it was last used. When the shards grow beyond max_bytes, the
+    least recently used shards are removed as a whole.
+
+    Attributes:
+        nlp (Language): The SpaCy pipeline whose annotations are cached.
+        cache_dir (Path): The directory of the shards of this pipeline.
+        max_bytes (int): The maximum total size of the shards.
+        hits (int): The number of texts read from the cache.
+        misses (int): The number of texts processed by the pipeline.
+    """
+
+    def __init__(self, nlp: Language, cache_dir: Path,
+                 max_bytes: int = ANNOTATION_CACHE_MAX_BYTES) -> None:
+        """
+        Open the AnnotationCache, creating it if it does not exist.
+
+        Args:
+            nlp (Language): The SpaCy pipeline whose annotations are
+            cached.
+            cache_dir (Path): The base directory of the cache.
+            max_bytes (int): The maximum total size of the shards.
+        """
+        self.nlp = nlp
+        self.cache_dir = Path(cache_dir) / self.model_id(nlp)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Doc] = {}
+        self._pending_chars = 0
+        self._used_shards: Set[int] = set()
+        self._loaded: "OrderedDict[int, List[Doc]]" = OrderedDict()
+        self._connection = sqlite3.connect(
+            str(self.cache_dir / INDEX_FILE_NAME))
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {SHARDS_TABLE} ("
+            "shard INTEGER PRIMARY KEY AUTOINCREMENT, size INTEGER, "
+            "used REAL)")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {ENTRIES_TABLE} ("
+            "key TEXT PRIMARY KEY, shard INTEGER, position INTEGER)")
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {ENTRIES_TABLE}_shard "
+            f"ON {ENTRIES_TABLE} (shard)")
+        self._connection.commit()
+        self._closed = False
+        self._size = self._total_size()
+
+    def __enter__(self) -> "AnnotationCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write the buffered entries and close the index."""
+        if self._closed:
+            return
+        self._write_shard()
+        self._record_use()
+        self._connection.close()
+        self._closed = True
+
+    @staticmethod
+    def model_id(nlp: Language) -> str:
+        """
+        Get an identifier of the name, version and components of a
+        SpaCy pipeline.
+
+        Args:
+            nlp (Language): The SpaCy pipeline.
+
+        Returns:
+            str: The identifier.
+        """
+        components = hashlib.sha1(
+            ",".join(nlp.pipe_names).encode(ENCODING)).hexdigest()[:8]
+        return (f"{nlp.lang}_{nlp.meta.get('name', '')}-"
+                f"{nlp.meta.get('version', '')}-{components}")
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """Get the key of the entry of a text."""
+        return hashlib.sha1(text.encode(ENCODING)).hexdigest()
+
+    def _shard_path(self, shard: int) -> Path:
+        """Get the file of a shard."""
+        return self.cache_dir / f"{shard}{SHARD_SUFFIX}"
+
+    def _total_size(self) -> int:
+        """Get the total size of the shards in the index."""
+        return self._connection.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {SHARDS_TABLE}").fetchone()[0]
+
+    def _load_shard(self, shard: int) -> Optional[List[Doc]]:
+        """Read the documents of a shard, keeping recent shards in memory."""
+        if shard in self._loaded:
+            self._loaded.move_to_end(shard)
+            return self._loaded[shard]
+        try:
+            doc_bin = DocBin().from_bytes(self._shard_path(shard).read_bytes())
+        except (OSError, ValueError):
+            return None
+        docs = list(doc_bin.get_docs(self.nlp.vocab))
+        self._loaded[shard] = docs
+        if len(self._loaded) > LOADED_SHARDS:
+            self._loaded.popitem(last=False)
+        return docs
+
+    def get(self, text: str) -> Optional[Doc]:
+        """
+        Look up the annotations of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Optional[Doc]: The processed text, or None if it is not cached.
+        """
+        key = self._key(text)
+        if key in self._pending:
+            return self._pending[key]
+        row = self._connection.execute(
+            f"SELECT shard, position FROM {ENTRIES_TABLE} WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+        shard, position = row
+        docs = self._load_shard(shard)
+        if docs is None or position >= len(docs) or \
+                docs[position].text != text:
+            return None
+        self._used_shards.add(shard)
+        return docs[position]
+
+    def put(self, text: str, doc: Doc) -> None:
+        """
+        Store the annotations of a text.
+
+        Args:
+            text (str): The text.
+            doc (Doc): The text processed by the pipeline.
+        """
+        key = self._key(text)
+        if key in self._pending:
+            return
+        self._pending[key] = doc
+        self._pending_chars += len(text)
+        if self._pending_chars >= SHARD_TEXT_CHARS:
+            self._write_shard()
+
+    def _write_shard(self) -> None:
+        """Write the buffered entries as a new shard."""
+        if not self._pending:
+            return
+        data = DocBin(docs=self._pending.values()).to_bytes()
+        shard = self._connection.execute(
+            f"INSERT INTO {SHARDS_TABLE} (size, used) VALUES (?, ?)",
+            (len(data), time.time())).lastrowid
+        assert shard is not None
+        shard_path = self._shard_path(shard)
+        tmp_path = shard_path.with_name(f"{shard_path.name}.{os.getpid()}")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, shard_path)
+        self._connection.executemany(
+            f"INSERT OR REPLACE INTO {ENTRIES_TABLE} VALUES (?, ?, ?)",
+            ((key, shard, position)
+             for position, key in enumerate(self._pending)))
+        self._connection.commit()
+        self._pending = {}
+        self._pending_chars = 0
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _record_use(self) -> None:
+        """Record the time the shards read since the last call were used."""
+        if not self._used_shards:
+            return
+        now = time.time()
+        self._connection.executemany(
+            f"UPDATE {SHARDS_TABLE} SET used = ? WHERE shard = ?",
+            ((now, shard) for shard in self._used_shards))
+        self._connection.commit()
+        self._used_shards = set()
+
+    def _evict(self) -> None:
+        """Remove the least recently used shards, down to 90% of
+        max_bytes."""
+        self._record_use()
+        self._size = self._total_size()
+        shards = self._connection.execute(
+            f"SELECT shard, size FROM {SHARDS_TABLE} ORDER BY used").fetchall()
+        for shard, size in shards:
+            if self._size <= 0.9 * self.max_bytes:
+                break
+            self._connection.execute(
+                f"DELETE FROM {ENTRIES_TABLE} WHERE shard = ?", (shard,))
+            self._connection.execute(
+                f"DELETE FROM {SHARDS_TABLE} WHERE shard = ?", (shard,))
+            self._shard_path(shard).unlink(missing_ok=True)
+            self._loaded.pop(shard, None)
+            self._size -= size
+        self._connection.commit()
+
+    def __call__(self, text: str) -> Doc:
+        """
+        Process a text, reading the annotations from the cache if possible.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Doc: The processed text.
+        """
+        doc = self.get(text)
+        if doc is not None:
+            self.hits += 1
+            return doc
+        self.misses += 1
+        doc = self.nlp(text)
+        self.put(text, doc)
+        return doc
+
+    def pipe(self, texts: Iterable[str], batch_size: int = NLP_BATCH_SIZE,
+             n_process: int = NLP_PROCESSES) -> Iterator[Doc]:
+        """
+        Process a stream of texts, reading annotations from the cache if
+        possible. Texts that are not cached are processed in batches.
+
+        Args:
+            texts (Iterable[str]): The texts.
+            batch_size (int): Number of texts per batch.
+            n_process (int): Number of processes.
+
+        Yields:
+            Doc: The processed texts, in the order of the input.
+        """
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                yield from self._pipe_batch(batch, batch_size, n_process)
+                batch = []
+        yield from self._pipe_batch(batch, batch_size, n_process)
+
+    def _pipe_batch(self, batch: List[str], batch_size: int,
+                    n_process: int) -> List[Doc]:
+        """Process a batch of texts, reading cached texts from the cache."""
+        docs: List[Optional[Doc]] = [self.get(text) for text in batch]
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        self.hits += len(batch) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            processed = self.nlp.pipe((batch[i] for i in missing),
+                                      batch_size=batch_size,
+                                      n_process=n_process)
+            for i, doc in zip(missing, processed):
+                self.put(batch[i], doc)
+                docs[i] = doc
+        return [doc for doc in docs if doc is not None]
+
+
+_annotation_caches: Dict[int, AnnotationCache] = {}
+
+
+def get_annotation_cache(nlp: Language) -> Optional[AnnotationCache]:
+    """
+    Get the annotation cache of a SpaCy pipeline.
+
+    Args:
+        nlp (Language): The SpaCy pipeline.
+
+    Returns:
+        Optional[AnnotationCache]: The cache, or None if no cache directory
+        is configured with ANNOTATION_CACHE_DIR.
+    """
+    if not ANNOTATION_CACHE_DIR:
+        return None
+    if id(nlp) not in _annotation_caches:
+        cache = AnnotationCache(nlp, Path(ANNOTATION_CACHE_DIR))
+        atexit.register(cache.close)
+        _annotation_caches[id(nlp)] = cache
+    return _annotation_caches[id(nlp)]
+
+
+def parse(nlp: Language, text: str) -> Doc:
+    """
+    Process a text with a SpaCy pipeline, using the annotation cache if
+    one is configured.
+
+    Args:
+        nlp (Language): The SpaCy pipeline.
+        text (str): The text.
+
+    Returns:
+        Doc: The processed text.
+    """
+    cache = get_annotation_cache(nlp)
+    if cache is None:
+        return nlp(text)
+    return cache(text)
+
+
+def parse_many(nlp: Language, texts: Iterable[str],
+               batch_size: int = NLP_BATCH_SIZE,
+               n_process: int = NLP_PROCESSES) -> Iterator[Doc]:
+    """
+    Process a stream of texts with a SpaCy pipeline, using the annotation
+    cache if one is configured.
+
+    Args:
+        nlp (Language): The SpaCy pipeline.
+        texts (Iterable[str]): The texts.
+        batch_size (int): Number of texts per batch.
+        n_process (int): Number of processes.
+
+    Returns:
+        Iterator[Doc]: The processed texts, in the order of the input.
+    """
+    cache = get_annotation_cache(nlp)
+    if cache is None:
+        return nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return cache.pipe(texts, batch_size=batch_size, n_process=n_process)
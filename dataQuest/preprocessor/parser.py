@@ -1,25 +1,140 @@
 
+import codecs
 import os
+import re
 import tarfile
 import gzip
 import json
+import time
 import xml.etree.ElementTree as ET
-from typing import Dict, Union, Any, Optional, List
+from typing import (Dict, Union, Any, Optional, List, Iterable, Tuple,
+                    Sequence, Type)
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import multiprocessing
+from multiprocessing import Pool
+from dataQuest.filter.block_gzip import (write_block_gzip, compress_members,
+                                         index_path, COMPACT_SEPARATORS)
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+ETREE_BACKEND = "etree"
+LXML_BACKEND = "lxml"
+XML_BACKENDS = [ETREE_BACKEND, LXML_BACKEND]
+ARTICLE_FIELDS = ["title", "p"]
+
+_XML_ENCODING = re.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')  # noqa: E501
+_UTF8_NAMES = (b"utf-8", b"utf8")
+
+if lxml_etree is not None:
+    _XML_PARSE_ERRORS: Tuple[Type[Exception], ...] = (ET.ParseError, lxml_etree.XMLSyntaxError)  # noqa: E501
+    _lxml_parser = lxml_etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)  # noqa: E501
+else:
+    _XML_PARSE_ERRORS = (ET.ParseError,)
+
+_tag_fields_cache: Dict[Tuple[str, ...], Dict[Any, Tuple[str, ...]]] = {}
+
+
+def parse_utf8_xml(data: bytes, xml_backend: str = ETREE_BACKEND) -> Optional[Any]:  # noqa: E501
+    """
+    Parses UTF-8 encoded XML without decoding it to a string first.
+
+    Parameters:
+        data (bytes): The XML document.
+        xml_backend (str): 'etree' to parse with xml.etree.ElementTree, or 'lxml' to parse with lxml.  # noqa: E501
+
+    Returns:
+        Optional[Any]: The root element, or None if the document is not UTF-8 encoded or cannot be parsed.  # noqa: E501
+        Such documents should be decoded and parsed as a string instead.
+    """
+    if data.startswith(codecs.BOM_UTF8) or b"\x00" in data[:4]:
+        return None
+    declaration = _XML_ENCODING.match(data)
+    if declaration is not None and declaration.group(1).lower() not in _UTF8_NAMES:  # noqa: E501
+        return None
+    try:
+        if xml_backend == LXML_BACKEND:
+            return lxml_etree.fromstring(data, _lxml_parser)
+        return ET.fromstring(data)
+    except _XML_PARSE_ERRORS:
+        return None
+
+
+def collect_texts(root: Any, fields: Sequence[str]) -> Dict[str, List[Optional[str]]]:  # noqa: E501
+    """
+    Collects the texts of the elements whose tags end with any of the fields, in a single traversal of the tree.  # noqa: E501
+
+    The fields matched by every tag are cached, so each distinct tag is compared to the fields only once.  # noqa: E501
+
+    Parameters:
+        root (Any): The root element.
+        fields (Sequence[str]): The tag suffixes to collect.
+
+    Returns:
+        Dict[str, List[Optional[str]]]: The texts of the matching elements per field, in document order.  # noqa: E501
+    """
+    fields = tuple(fields)
+    tag_fields = _tag_fields_cache.setdefault(fields, {})
+    texts: Dict[str, List[Optional[str]]] = {field: [] for field in fields}
+    for element in root.iter():
+        tag = element.tag
+        matched = tag_fields.get(tag)
+        if matched is None:
+            # lxml returns comments and processing instructions, whose tag is not a string.  # noqa: E501
+            matched = tuple(field for field in fields if isinstance(tag, str) and tag.endswith(field))  # noqa: E501
+            tag_fields[tag] = matched
+        for field in matched:
+            texts[field].append(element.text)
+    return texts
+
+
+def _init_worker(log_queue: Any, log_level: int) -> None:
+    """
+    Sends the log records of a worker process to the main process, so records of concurrent workers are not interleaved.  # noqa: E501
+
+    Parameters:
+        log_queue (multiprocessing.Queue): The queue read by the main process.
+        log_level (int): The log level of the main process.
+    """
+    root_logger = logging.getLogger()
+    root_logger.handlers = [QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
 
 
 class XMLExtractor:
     """Class for extracting XML content and metadata from nested .tgz files."""  # noqa: E501
-    def __init__(self, root_dir: str, output_dir: str):
+    def __init__(self, root_dir: str, output_dir: str, indexed: bool = False,  # noqa: E501
+                 workers: int = 1, xml_backend: str = ETREE_BACKEND,
+                 compact: bool = False, compresslevel: int = 9,
+                 compress_threads: int = 1):
         """
         Initializes the XMLExtractor object.
 
         Parameters:
             root_dir (str): The root directory containing .tgz files.
             output_dir (str): The output directory for saving extracted JSON files.  # noqa: E501
+            indexed (bool): Save every article as a separate gzip block, with an index for reading single articles.  # noqa: E501
+            workers (int): Number of processes converting .tgz files. With one worker the files are converted in the current process.  # noqa: E501
+            xml_backend (str): 'etree' to parse XML with xml.etree.ElementTree, or 'lxml' to parse XML with lxml, which must be installed.  # noqa: E501
+            compact (bool): Write JSON without indentation and whitespace between items.  # noqa: E501
+            compresslevel (int): The gzip compression level of the output files, from 1 (fastest) to 9 (smallest).  # noqa: E501
+            compress_threads (int): Number of threads compressing an output file.  # noqa: E501
         """
+        if xml_backend not in XML_BACKENDS:
+            raise ValueError(f"Unknown XML backend: '{xml_backend}'")
+        if xml_backend == LXML_BACKEND and lxml_etree is None:
+            raise ValueError("The lxml backend requires the 'lxml' package.")  # noqa: E501
         self.root_dir = root_dir
         self.output_dir = output_dir
+        self.indexed = indexed
+        self.workers = workers
+        self.xml_backend = xml_backend
+        self.compact = compact
+        self.compresslevel = compresslevel
+        self.compress_threads = compress_threads
         self.fields = [
             "title", "language", "issuenumber", "date", "identifier",
             "temporal", "recordRights", "publisher", "spatial", "source",
@@ -29,44 +144,151 @@ class XMLExtractor:
     def extract_xml_string(self) -> None:
         """
         Extracts XML content and metadata from .tgz files in the root directory.  # noqa: E501
+
+        With more than one worker, the .tgz files are spread over a pool of processes.  # noqa: E501
+        The log records of the workers are written by the main process.
+        """
+        self.process_archives(self.list_archives())
+
+    def process_archives(self, archives: List[Tuple[str, str]]) -> None:
+        """
+        Converts .tgz files, spread over a pool of processes if there is more than one worker.  # noqa: E501
+
+        Parameters:
+            archives (List[Tuple[str, str]]): The folder name and path of every .tgz file.  # noqa: E501
+        """
+        if self.workers <= 1:
+            self.log_throughput(map(self._process_archive_task, archives))
+            return
+
+        log_queue: Any = multiprocessing.Queue()
+        root_logger = logging.getLogger()
+        with Pool(self.workers, initializer=_init_worker,
+                  initargs=(log_queue, root_logger.level)) as pool:
+            listener = QueueListener(log_queue, *root_logger.handlers,
+                                     respect_handler_level=True)
+            listener.start()
+            try:
+                self.log_throughput(pool.imap_unordered(
+                    self._process_archive_task, archives))
+            finally:
+                listener.stop()
+
+    def list_archives(self) -> List[Tuple[str, str]]:
         """
-        for folder_name in os.listdir(self.root_dir):
+        Lists the .tgz files in the folders of the root directory.
+
+        Returns:
+            List[Tuple[str, str]]: The folder name and path of every .tgz file.  # noqa: E501
+        """
+        archives = []
+        for folder_name in sorted(os.listdir(self.root_dir)):
             folder_path = os.path.join(self.root_dir, folder_name)
             if not os.path.isdir(folder_path):
                 continue
             if not folder_name.isdigit():  # Exclude in_progress, manifests, and ocr_complete folders and log files.  # noqa: E501
                 continue
-            self.process_folder(folder_name, folder_path)
+            archives.extend(self.list_folder_archives(folder_name, folder_path))  # noqa: E501
+        return archives
+
+    @staticmethod
+    def list_folder_archives(folder_name: str, folder_path: str) -> List[Tuple[str, str]]:  # noqa: E501
+        """
+        Lists the .tgz files in a folder.
+
+        Parameters:
+            folder_name (str): Name of the folder.
+            folder_path (str): Path to the folder.
+
+        Returns:
+            List[Tuple[str, str]]: The folder name and path of every .tgz file.  # noqa: E501
+        """
+        return [(folder_name, os.path.join(folder_path, tgz_filename))
+                for tgz_filename in sorted(os.listdir(folder_path))
+                if tgz_filename.endswith('.tgz')]
 
     def process_folder(self, folder_name: str, folder_path: str) -> None:
         """
-        Processes .tgz files within a folder.
+        Processes .tgz files within a folder, with the workers of the extractor.  # noqa: E501
 
         Parameters:
             folder_name (str): Name of the folder being processed.
             folder_path (str): Path to the folder being processed.
         """
-        for tgz_filename in os.listdir(folder_path):
-            if not tgz_filename.endswith('.tgz'):
-                continue
-            tgz_file_path = os.path.join(folder_path, tgz_filename)
-            base_name = os.path.splitext(tgz_filename)[0]
-            output_folder = os.path.join(self.output_dir, folder_name)
-            os.makedirs(output_folder, exist_ok=True)
-            try:
-                with tarfile.open(tgz_file_path, "r:gz") as outer_tar:
-                    news_dict = self.process_tar(outer_tar)
-            except tarfile.TarError as e:
-                logging.error(f"Error extracting {tgz_filename}: {e}")
-                continue
-            output_file = os.path.join(output_folder, f"{base_name}.json.gz")
-            self.save_as_json_compressed(news_dict, output_file)
-            # self.save_as_json(news_dict, output_file)
+        self.process_archives(self.list_folder_archives(folder_name, folder_path))  # noqa: E501
+
+    def process_archive(self, folder_name: str, tgz_file_path: str) -> int:
+        """
+        Converts a .tgz file to a compressed JSON file.
+
+        Parameters:
+            folder_name (str): Name of the folder of the .tgz file.
+            tgz_file_path (str): Path to the .tgz file.
+
+        Returns:
+            int: The number of converted articles.
+        """
+        tgz_filename = os.path.basename(tgz_file_path)
+        base_name = os.path.splitext(tgz_filename)[0]
+        output_folder = os.path.join(self.output_dir, folder_name)
+        os.makedirs(output_folder, exist_ok=True)
+        try:
+            with tarfile.open(tgz_file_path, "r|gz") as outer_tar:
+                news_dict = self.process_tar(outer_tar)
+        except tarfile.TarError as e:
+            logging.error(f"Error extracting {tgz_filename}: {e}")
+            return 0
+        output_file = os.path.join(output_folder, f"{base_name}.json.gz")
+        if self.indexed:
+            self.save_as_indexed_json_compressed(news_dict, output_file, self.compact, self.compresslevel)  # noqa: E501
+        else:
+            self.save_as_json_compressed(news_dict, output_file, self.compact, self.compresslevel, self.compress_threads)  # noqa: E501
+        # self.save_as_json(news_dict, output_file)
+        return len(news_dict["articles"])
+
+    def _process_archive_task(self, archive: Tuple[str, str]) -> Tuple[int, int, float]:  # noqa: E501
+        """
+        Converts a .tgz file and measures the conversion.
+
+        Parameters:
+            archive (Tuple[str, str]): The folder name and path of the .tgz file.  # noqa: E501
+
+        Returns:
+            Tuple[int, int, float]: The process id, the number of converted articles and the conversion time in seconds.  # noqa: E501
+        """
+        start = time.perf_counter()
+        articles = self.process_archive(*archive)
+        return os.getpid(), articles, time.perf_counter() - start
+
+    @staticmethod
+    def log_throughput(results: Iterable[Tuple[int, int, float]]) -> None:
+        """
+        Logs the throughput of every worker process.
+
+        Parameters:
+            results (Iterable[Tuple[int, int, float]]): The process id, the number of converted articles and the conversion time of every .tgz file.  # noqa: E501
+        """
+        start = time.perf_counter()
+        stats: Dict[int, Tuple[int, int, float]] = {}
+        for pid, articles, seconds in results:
+            worker_archives, worker_articles, worker_seconds = stats.get(pid, (0, 0, 0.0))  # noqa: E501
+            stats[pid] = (worker_archives + 1, worker_articles + articles, worker_seconds + seconds)  # noqa: E501
+        for pid, (archives, articles, seconds) in sorted(stats.items()):
+            logging.info(f"Worker {pid}: {archives} archives, {articles} articles in {seconds:.1f} s "  # noqa: E501
+                         f"({articles / max(seconds, 1e-9):.1f} articles/s)")  # noqa: E501
+        total_archives = sum(worker_stats[0] for worker_stats in stats.values())  # noqa: E501
+        total_articles = sum(worker_stats[1] for worker_stats in stats.values())  # noqa: E501
+        elapsed = time.perf_counter() - start
+        logging.info(f"Converted {total_archives} archives, {total_articles} articles in {elapsed:.1f} s "  # noqa: E501
+                     f"({total_articles / max(elapsed, 1e-9):.1f} articles/s)")  # noqa: E501
 
     def process_tar(self, outer_tar: tarfile.TarFile) -> Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]]:  # noqa: E501
         """
         Processes a .tgz file and extracts XML content and metadata.
 
+        The members are handled in a single pass as they are read, so the .tgz file can be opened in stream mode ("r|gz").  # noqa: E501
+        Only the first .gz member is read as metadata.
+
         Parameters:
             outer_tar (tarfile.TarFile): The .tgz file being processed.
 
@@ -75,26 +297,25 @@ class XMLExtractor:
         """
         news_dict: Dict[str, Any] = {"newsletter_metadata": {}, "articles": {}}
         id = 0
+        metadata_read = False
         for entry in outer_tar:
             try:
                 if entry.name.endswith(".xml"):
                     file = outer_tar.extractfile(entry)
                     if file is not None:
                         content = file.read()
-                        xml_content = content.decode('utf-8', 'ignore')
-                        article = self.extract_article(xml_content, entry.name)
+                        article = self.extract_article(content, entry.name, self.xml_backend)  # noqa: E501
                         id += 1
                         news_dict["articles"][id] = article
 
                 elif entry.name.endswith(".gz"):
-                    gz_member = next(member for member in outer_tar.getmembers() if member.name.endswith('.gz'))  # noqa: E501
-                    with outer_tar.extractfile(gz_member) as gz_file:  # type: ignore  # noqa: E501
-                        with gzip.open(gz_file, 'rt') as xml_file:
-                            xml_string = xml_file.read()
-                            if isinstance(xml_string, bytes):
-                                xml_string = xml_string.decode('utf-8')
-                            newsletter_metadata = self.extract_meta(xml_string)
-                            news_dict["newsletter_metadata"] = newsletter_metadata  # noqa: E501
+                    if metadata_read:
+                        continue
+                    metadata_read = True
+                    with outer_tar.extractfile(entry) as gz_file:  # type: ignore  # noqa: E501
+                        xml_bytes = gzip.decompress(gz_file.read())
+                    newsletter_metadata = self.extract_meta(xml_bytes)
+                    news_dict["newsletter_metadata"] = newsletter_metadata
                 else:
                     continue
             except Exception as e:
@@ -102,21 +323,54 @@ class XMLExtractor:
         return news_dict
 
     @staticmethod
-    def save_as_json_compressed(data: Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]], output_file: str) -> None:  # noqa: E501
+    def save_as_json_compressed(data: Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]], output_file: str,  # noqa: E501
+                                compact: bool = False, compresslevel: int = 9, threads: int = 1) -> None:  # noqa: E501
         """
         Saves data as compressed JSON using gzip.
 
+        The index of an earlier indexed conversion of the file is removed.
+
         Parameters:
             data (Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]]): Data to be saved as JSON.  # noqa: E501
             output_file (str): Path to the output JSON file.
+            compact (bool): Write JSON without indentation and whitespace between items.  # noqa: E501
+            compresslevel (int): The gzip compression level.
+            threads (int): Number of threads compressing the file. With more than one thread, the file is written as a series of gzip members.  # noqa: E501
         """
         try:
-            with gzip.open(output_file, 'wt', encoding='utf-8') as json_file:
-                json.dump(data, json_file, indent=4, ensure_ascii=False)
+            if compact:
+                text = json.dumps(data, ensure_ascii=False, separators=COMPACT_SEPARATORS)  # noqa: E501
+            else:
+                text = json.dumps(data, indent=4, ensure_ascii=False)
+            content = text.encode('utf-8')
+            if threads > 1:
+                with open(output_file, 'wb') as json_file:
+                    json_file.write(compress_members(content, compresslevel, threads))  # noqa: E501
+            else:
+                with gzip.open(output_file, 'wb', compresslevel=compresslevel) as json_file:  # noqa: E501
+                    json_file.write(content)
+            index_path(output_file).unlink(missing_ok=True)
 
         except Exception as e:
             logging.error(f"Error saving compressed JSON to {output_file}: {e}")  # noqa: E501
 
+    @staticmethod
+    def save_as_indexed_json_compressed(data: Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]], output_file: str,  # noqa: E501
+                                        compact: bool = False, compresslevel: int = 9) -> None:  # noqa: E501
+        """
+        Saves data as compressed JSON with one gzip block per article, and an index of the blocks.  # noqa: E501
+
+        Parameters:
+            data (Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]]): Data to be saved as JSON.  # noqa: E501
+            output_file (str): Path to the output JSON file.
+            compact (bool): Write JSON without whitespace between items.
+            compresslevel (int): The gzip compression level.
+        """
+        try:
+            write_block_gzip(data, output_file, compresslevel, compact)
+        except Exception as e:
+            logging.error(f"Error saving indexed JSON to {output_file}: {e}")  # noqa: E501
+
     # @staticmethod
     # def save_as_json(data: Dict[str, Union[Dict[str, str], Dict[int, Dict[str, str]]]], output_file: str) -> None:  # noqa: E501
     #     """
@@ -133,25 +387,35 @@ class XMLExtractor:
     #         logging.error(f"Error saving JSON to {output_file}: {e}")
 
     @staticmethod
-    def extract_article(xml_content: str, file_name: str) -> Dict[str, Union[str, List[Optional[str]]]]:  # noqa: E501
+    def extract_article(xml_content: Union[str, bytes], file_name: str, xml_backend: str = ETREE_BACKEND) -> Dict[str, Union[str, List[Optional[str]]]]:  # noqa: E501
         """
         Extracts article title and body from XML content.
 
+        UTF-8 encoded bytes are parsed directly. Other bytes are decoded as UTF-8, ignoring invalid bytes.  # noqa: E501
+
         Parameters:
-            xml_content (str): XML content of the article.
+            xml_content (Union[str, bytes]): XML content of the article.
             file_name (str): Name of the XML file.
+            xml_backend (str): 'etree' or 'lxml', see XMLExtractor.
 
         Returns:
             Dict[Optional[str], list[str]]: A dictionary containing the extracted title and body of the article.
               body contains a list of paragraphs.  # noqa: E501
         """
-        try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError:
-            logging.error(f"Failed to parse XML from file: {file_name}")
-            return {}
+        root = None
+        if isinstance(xml_content, bytes):
+            root = parse_utf8_xml(xml_content, xml_backend)
+            if root is None:
+                xml_content = xml_content.decode('utf-8', 'ignore')
+        if root is None:
+            try:
+                root = ET.fromstring(xml_content)
+            except ET.ParseError:
+                logging.error(f"Failed to parse XML from file: {file_name}")
+                return {}
 
-        title_values = [element.text for element in root.iter() if element.tag.endswith('title')]  # noqa: E501
+        texts = collect_texts(root, ARTICLE_FIELDS)
+        title_values = texts["title"]
         if len(title_values) > 1:
             logging.warning("More than one titles are extracted for the article.")  # noqa: E501
         if not title_values:
@@ -161,7 +425,7 @@ class XMLExtractor:
             title = title_values[0] if title_values[0] is not None else ""
             # title = title_values[0]
 
-        body_values = [element.text for element in root.iter() if element.tag.endswith('p')]  # noqa: E501
+        body_values = texts["p"]
         if not body_values:
             logging.warning("No body is extracted.")
             body = []
@@ -174,26 +438,35 @@ class XMLExtractor:
 
         return {"title": title, "body": body}
 
-    def extract_meta(self, xml_string: str) -> Dict[str, Union[str, None]]:
+    def extract_meta(self, xml_string: Union[str, bytes]) -> Dict[str, Union[str, None]]:  # noqa: E501
         """
         Extracts metadata from XML string.
 
+        UTF-8 encoded bytes are parsed directly. Other bytes are decoded as UTF-8.  # noqa: E501
+
         Parameters:
-            xml_string (str): XML string containing metadata.
+            xml_string (Union[str, bytes]): XML string containing metadata.
 
         Returns:
             Dict[str, Union[str, None]]: A dictionary containing the extracted metadata.  # noqa: E501
         """
         newsletter_metadata: Dict[str, Union[str, None]] = {}
 
-        try:
-            root = ET.fromstring(xml_string)
-        except ET.ParseError:
-            logging.error("Failed to parse XML from file")
-            return newsletter_metadata
+        root = None
+        if isinstance(xml_string, bytes):
+            root = parse_utf8_xml(xml_string, self.xml_backend)
+            if root is None:
+                xml_string = xml_string.decode('utf-8')
+        if root is None:
+            try:
+                root = ET.fromstring(xml_string)
+            except ET.ParseError:
+                logging.error("Failed to parse XML from file")
+                return newsletter_metadata
 
+        texts = collect_texts(root, self.fields)
         for field in self.fields:
-            field_values = [element.text for element in root.iter() if element.tag.endswith(field)]  # noqa: E501
+            field_values = texts[field]
             if len(field_values) > 1:
                 logging.warning(f"More than one {field}s are extracted from metadata.")  # noqa: E501
             if not field_values:
@@ -3,10 +3,12 @@ This module provides a TextCleaner class for preprocessing text
 data using various cleaning techniques.
 """
 import re
-from typing import Union, List
+from typing import Iterable, Iterator, Union, List
 from spacy.language import Language
-from dataQuest.settings import SPACY_MODEL
+from spacy.tokens import Doc
+from dataQuest.settings import SPACY_MODEL, NLP_BATCH_SIZE, NLP_PROCESSES
 from dataQuest.utils import initialize_nlp
+from dataQuest.preprocessor.annotation_cache import parse, parse_many
 
 
 def merge_texts_list(text: Union[str, List[str]]) -> str:
@@ -52,13 +54,22 @@ class TextCleaner:
             and then lemmatizes each token, converting it to lowercase.
             Stop words and punctuation tokens are filtered out.
         """
-        doc = self.nlp(self.text)
+        self.set_lower_lemma_tokens(parse(self.nlp, self.text))
+
+    def set_lower_lemma_tokens(self, doc: Doc) -> None:
+        """
+            Set the text to the lowercased lemmatized tokens of a processed
+            document, without stop words and punctuation tokens.
+
+            Args:
+                doc (Doc): The text processed by the SpaCy pipeline.
+        """
         self.text = " ".join([token.lemma_.lower() for token in doc
                               if not token.is_stop and not token.is_punct])
 
     def get_words(self):
         """Tokenize words in the text."""
-        doc = self.nlp(self.text)
+        doc = parse(self.nlp, self.text)
         self.text = " ".join([token.text for token in doc])
 
     def lower(self):
@@ -67,7 +78,7 @@ class TextCleaner:
 
     def remove_stopwords(self):
         """Remove the stopwords from the text."""
-        doc = self.nlp(self.text)
+        doc = parse(self.nlp, self.text)
         self.text = " ".join([token.text for token in doc if token.text
                               not in self.stopwords])
 
@@ -107,6 +118,32 @@ class TextCleaner:
         self.remove_one_char()
         return self.text
 
+    def preprocess_many(self, texts: Iterable[Union[str, List[str]]],
+                        batch_size: int = NLP_BATCH_SIZE,
+                        n_process: int = NLP_PROCESSES) -> Iterator[str]:
+        """Preprocess a stream of texts with the same steps as preprocess.
+
+        The texts are processed in batches by the SpaCy pipeline, optionally
+        in several processes.
+
+        Args:
+            texts (Iterable[Union[str, List[str]]]): The texts to
+            preprocess.
+            batch_size (int): Number of texts per batch.
+            n_process (int): Number of processes.
+
+        Yields:
+            str: The preprocessed texts, in the order of the input.
+        """
+        for doc in parse_many(self.nlp,
+                              (merge_texts_list(text) for text in texts),
+                              batch_size=batch_size, n_process=n_process):
+            self.set_lower_lemma_tokens(doc)
+            self.remove_numeric()
+            self.remove_extra_whitespace_tabs()
+            self.remove_one_char()
+            yield self.text
+
     def clean(self, text):
         """Clean the given text by removing non-standard characters and
            extra whitespace.
@@ -8,3 +8,24 @@ SPACY_MODEL = os.getenv("SPACY_MODEL", "nl_core_news_sm")
 
 ENCODING = os.getenv("ENCODING", "utf-8")
 """Encoding used for reading and writing files."""
+
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "8"))
+"""Number of parsed input documents kept in memory."""
+
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "256"))
+"""Number of texts processed per batch by the SpaCy model."""
+
+NLP_PROCESSES = int(os.getenv("NLP_PROCESSES", "1"))
+"""Number of processes used by the SpaCy model to process texts."""
+
+ANNOTATION_CACHE_DIR = os.getenv("ANNOTATION_CACHE_DIR")
+"""Directory of the cache of SpaCy annotations; no cache is used if unset."""
+
+ANNOTATION_CACHE_MAX_BYTES = int(os.getenv("ANNOTATION_CACHE_MAX_BYTES",
+                                           str(10 * 1024 ** 3)))
+"""Maximum size of the cache of SpaCy annotations in bytes."""
+
+TFIDF_MEMORY_BUDGET = int(os.getenv("TFIDF_MEMORY_BUDGET", "0"))
+"""Approximate memory in bytes for scoring the articles of a period; if
+set, the cleaned articles are spooled to disk and scored in batches. All
+articles are scored in memory if 0."""
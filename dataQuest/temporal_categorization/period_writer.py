@@ -0,0 +1,120 @@
+"""
+This module provides a writer that groups categorized articles by time
+period and writes them to one CSV file per period.
+"""
+import csv
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+from dataQuest.settings import ENCODING
+
+
+class PeriodWriter:
+    """
+    Buffer rows per time period and append them to period files.
+
+    Rows are kept in memory until max_buffered_rows rows are buffered in
+    total, after which all buffers are appended to their files. Every
+    period file is therefore opened once per flush instead of once per row.
+
+    Attributes:
+        output_dir (Path): The directory of the period files.
+        file_prefix (str): Prefix of the period file names.
+        columns (List[str]): The columns of the period files.
+        max_buffered_rows (int): The number of rows buffered before the
+        buffers are flushed.
+    """
+
+    def __init__(self, output_dir: Path, file_prefix: str,
+                 columns: List[str],
+                 max_buffered_rows: int = 100000) -> None:
+        """
+        Initialize the PeriodWriter.
+
+        Args:
+            output_dir (Path): The directory of the period files.
+            file_prefix (str): Prefix of the period file names; files are
+            named '<file_prefix>_<period>.csv'.
+            columns (List[str]): The columns of the period files.
+            max_buffered_rows (int): The number of rows buffered before
+            the buffers are flushed.
+        """
+        self.output_dir = output_dir
+        self.file_prefix = file_prefix
+        self.columns = columns
+        self.max_buffered_rows = max_buffered_rows
+        self._buffers: Dict[Union[int, str], List[Dict[str, str]]] = {}
+        self._num_buffered = 0
+
+    def __enter__(self) -> "PeriodWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def period_file(self, period: Union[int, str]) -> Path:
+        """
+        Get the path of the file of a period.
+
+        Args:
+            period (Union[int, str]): The time period.
+
+        Returns:
+            Path: The path of the period file.
+        """
+        return self.output_dir / f"{self.file_prefix}_{period}.csv"
+
+    def add(self, period: Union[int, str], row: Dict[str, str]) -> None:
+        """
+        Add a row to the buffer of a period.
+
+        Args:
+            period (Union[int, str]): The time period of the row.
+            row (Dict[str, str]): The row, with the keys in columns.
+        """
+        self._buffers.setdefault(period, []).append(row)
+        self._num_buffered += 1
+        if self._num_buffered >= self.max_buffered_rows:
+            self.flush()
+
+    def add_many(self, period: Union[int, str],
+                 rows: List[Dict[str, str]]) -> bool:
+        """
+        Add the rows of an input file to the buffer of a period.
+
+        The rows are written together, so a file is never written partly.
+
+        Args:
+            period (Union[int, str]): The time period of the rows.
+            rows (List[Dict[str, str]]): The rows, with the keys in columns.
+
+        Returns:
+            bool: True if the buffers were flushed.
+        """
+        self._buffers.setdefault(period, []).extend(rows)
+        self._num_buffered += len(rows)
+        if self._num_buffered >= self.max_buffered_rows:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Append the buffered rows to their period files."""
+        for period, rows in self._buffers.items():
+            file_path = self.period_file(period)
+            write_header = (not file_path.exists()
+                            or os.path.getsize(file_path) == 0)
+            with open(file_path, "a", encoding=ENCODING,
+                      newline="") as period_file:
+                writer = csv.DictWriter(period_file, fieldnames=self.columns,
+                                        extrasaction="ignore",
+                                        lineterminator="\n")
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(rows)
+        self._buffers = {}
+        self._num_buffered = 0
+
+    def close(self) -> None:
+        """Write all buffered rows."""
+        self.flush()
@@ -3,8 +3,9 @@ This module provides classes and utilities for working with data
 that includes timestamps.
 """
 import json
-from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional
+from dataQuest.filter.document import parse_date
 
 
 class TimestampedData:
@@ -18,7 +19,8 @@ class TimestampedData:
         _timestamp (datetime): The timestamp extracted from the data.
 
     Methods:
-        __init__(self, filename): Initializes the TimestampedData object.
+        __init__(self, filename, data): Initializes the TimestampedData
+        object.
         filename(self) -> Path: Returns the filename path.
         _load_data(self): Loads data from the file.
         _get_timestamp(self): Extracts the timestamp from the data.
@@ -27,24 +29,30 @@ class TimestampedData:
 
     DATE_FIELD = "Date"
 
-    def __init__(self, filename: Path):
+    def __init__(self, filename: Optional[Path] = None,
+                 data: Optional[Dict[str, str]] = None):
         """
         Initializes the TimestampedData object.
 
         Args:
-            filename (Path): The path to the file containing the data.
+            filename (Optional[Path]): The path to the file containing the
+            data.
+            data (Optional[Dict[str, str]]): The data itself, e.g. a row of
+            a manifest file. If given, no file is read.
         """
+        if filename is None and data is None:
+            raise ValueError("Either filename or data must be given.")
         self._filename = filename
-        self._data = self._load_data()
+        self._data = data if data is not None else self._load_data()
         self._timestamp = self._get_timestamp()
 
     @property
-    def filename(self) -> Path:
+    def filename(self) -> Optional[Path]:
         """
         Returns the filename path.
 
         Returns:
-            Path: The filename path.
+            Optional[Path]: The filename path.
         """
         return self._filename
 
@@ -74,7 +82,7 @@ class TimestampedData:
         Returns:
             datetime: The extracted timestamp.
         """
-        return datetime.strptime(self._data[self.DATE_FIELD], '%Y-%m-%d')
+        return parse_date(self._data[self.DATE_FIELD])
 
     def categorize(self):
         """
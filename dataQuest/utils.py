@@ -70,7 +70,9 @@ def create_filter(filter_config: Dict[str, Any]) -> DocumentFilter:
     if filter_type == 'DecadeFilter':
         return DecadeFilter(filter_config['decade'])
     if filter_type == 'KeywordsFilter':
-        return KeywordsFilter(filter_config['keywords'])
+        return KeywordsFilter(filter_config['keywords'],
+                              filter_config.get('ignore_case', False),
+                              filter_config.get('whole_words', False))
     if filter_type == 'ArticleTitleFilter':
         return ArticleTitleFilter(filter_config['article_title'])
     if filter_type == 'AndFilter':
@@ -170,33 +172,64 @@ def read_config(config_file: Path, item_key: str) -> Dict[str, Union[str, float,
         raise KeyError("Key item %s not found in config file") from exc
 
 
-def save_filtered_articles(input_file: Any, article_id: str,
-                           output_dir: Path) -> None:
-    """Save filtered articles data to a JSON file.
+def get_filtered_article_data(input_file: Any,
+                              article_id: str) -> Dict[str, str]:
+    """Collect the data stored for a filtered article.
 
     Args:
         input_file: The input file object.
         article_id (str): The ID of the article.
-        output_dir (str): The directory where the JSON file will be saved.
 
     Returns:
-        None
+        Dict[str, str]: The file path, article ID, date and title of the
+        article.
     """
-    data = {
+    document = input_file.doc()
+    return {
         "file_path": str(input_file.filepath),
         "article_id": str(article_id),
-        "Date": str(input_file.doc().publish_date),
-        "Title": input_file.doc().title,
+        "Date": str(document.publish_date),
+        "Title": document.title,
     }
 
-    output_fp = os.path.join(output_dir, input_file.base_file_name() + '_' +
-                             str(article_id) + '.json')
+
+def save_filtered_article_data(data: Dict[str, str], base_file_name: str,
+                               output_dir: Path) -> None:
+    """Save the data of a filtered article to a JSON file.
+
+    Args:
+        data (Dict[str, str]): The article data, as returned by
+        get_filtered_article_data.
+        base_file_name (str): The base file name of the input file.
+        output_dir (str): The directory where the JSON file will be saved.
+
+    Returns:
+        None
+    """
+    output_fp = os.path.join(output_dir, base_file_name + '_' +
+                             data["article_id"] + '.json')
 
     print('output_fp', output_fp)
     with open(output_fp, "w", encoding=ENCODING) as json_file:
         json.dump(data, json_file, indent=4)
 
 
+def save_filtered_articles(input_file: Any, article_id: str,
+                           output_dir: Path) -> None:
+    """Save filtered articles data to a JSON file.
+
+    Args:
+        input_file: The input file object.
+        article_id (str): The ID of the article.
+        output_dir (str): The directory where the JSON file will be saved.
+
+    Returns:
+        None
+    """
+    data = get_filtered_article_data(input_file, article_id)
+    save_filtered_article_data(data, input_file.base_file_name(), output_dir)
+
+
 def get_file_name_without_extension(full_path: str) -> str:
     """
     Extracts the file name without extension from a full path.
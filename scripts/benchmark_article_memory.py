@@ -0,0 +1,83 @@
+"""
+Benchmark the memory used by the articles of an issue.
+
+The articles of Delpher issues are read with KrantenFile and compared to the
+previous data model, which joined the body of every article on creation and
+stored its attributes in a dict.
+"""
+from argparse import ArgumentParser
+import gc
+import gzip
+import json
+import logging
+from pathlib import Path
+import time
+import tracemalloc
+
+from dataQuest.filter.delpher_kranten import KrantenFile
+
+
+class EagerArticle:  # pylint: disable=too-few-public-methods
+    """The previous Article, which joins the body on creation."""
+    def __init__(self, article_id, title, body):
+        self.id = article_id
+        self.title = title
+        if isinstance(body, list):
+            self.text = ("" if any(item is None for item in body)
+                         else "\n".join(body))
+        else:
+            self.text = body
+
+
+def parse_arguments():
+    parser = ArgumentParser(
+        prog="benchmark_article_memory.py",
+        description="Measure the memory per article of Delpher issues.")
+    parser.add_argument("--input_dir", default="../example/data",
+                        help="Directory with converted .json.gz files.")
+    parser.add_argument("--glob", default="*.json.gz")
+    return parser.parse_args()
+
+
+def read_articles(path, article_class):
+    # Read like KrantenFile, so only the articles remain referenced.
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        articles = json.load(f)[KrantenFile.ARTICLES_FIELD]
+    return [article_class(article_id, article["title"], article["body"])
+            for article_id, article in articles.items()]
+
+
+def measure(paths, article_class, access_text):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    issues = [read_articles(path, article_class) for path in paths]
+    if access_text:
+        for articles in issues:
+            for article in articles:
+                article.text  # pylint: disable=pointless-statement
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = sum(len(articles) for articles in issues)
+    return size / count, elapsed / count
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    logging.disable(logging.WARNING)
+    paths = sorted(Path(args.input_dir).rglob(args.glob))
+    if not paths:
+        raise SystemExit(f"No input files in {args.input_dir}")
+
+    from dataQuest.filter.document import Article  # noqa: E402
+
+    print(f"{len(paths)} issues")
+    print(f"{'model':36}{'bytes/article':>14}{'us/article':>12}")
+    for name, article_class, access_text in (
+            ("eager, dict", EagerArticle, False),
+            ("lazy, slots, text not accessed", Article, False),
+            ("lazy, slots, text accessed", Article, True)):
+        size, elapsed = measure(paths, article_class, access_text)
+        print(f"{name:36}{size:14.0f}{elapsed * 1e6:12.1f}")
@@ -0,0 +1,81 @@
+"""
+Benchmark the similarity of documents with the keywords.
+
+sklearn's cosine_similarity with a dense keyword vector, as used before, is
+compared to KeywordSimilarity on a synthetic, l2-normalized TF-IDF matrix.
+"""
+from argparse import ArgumentParser
+import time
+
+import numpy as np
+import scipy
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from dataQuest.article_final_selection.keyword_similarity import (
+    KeywordSimilarity)
+
+
+def parse_arguments():
+    parser = ArgumentParser(
+        prog="benchmark_keyword_similarity.py",
+        description="Benchmark the similarity of documents with keywords.")
+    parser.add_argument("--rows", type=int, default=1000000,
+                        help="Number of documents of the period.")
+    parser.add_argument("--columns", type=int, default=500000,
+                        help="Size of the vocabulary.")
+    parser.add_argument("--terms", type=int, default=40,
+                        help="Average number of distinct terms of a "
+                             "document.")
+    parser.add_argument("--keywords", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def make_documents(rng, rows, columns, terms):
+    # Term frequencies follow Zipf's law, like those of a vocabulary.
+    nnz = rows * terms
+    indices = np.minimum(rng.zipf(1.3, nnz) - 1, columns - 1)
+    indptr = np.arange(0, nnz + 1, terms)
+    data = rng.random(nnz)
+    matrix = scipy.sparse.csr_matrix((data, indices, indptr),
+                                     shape=(rows, columns))
+    matrix.sum_duplicates()
+    return normalize(matrix)
+
+
+def reference_scores(keywords_embedding, documents):
+    dense = np.asarray(keywords_embedding.mean(axis=0)).flatten()
+    return cosine_similarity([dense], documents)[0]
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    rng = np.random.default_rng(args.seed)
+    documents = make_documents(rng, args.rows, args.columns, args.terms)
+    keyword_columns = rng.choice(200, args.keywords, replace=False)
+    keywords_embedding = normalize(scipy.sparse.csr_matrix(
+        (rng.random(args.keywords), keyword_columns,
+         [0, args.keywords]), shape=(1, args.columns)))
+    print(f"{args.rows} documents, {documents.nnz} non-zero values")
+
+    before, expected = best_time(
+        lambda: reference_scores(keywords_embedding, documents), args.repeat)
+    print(f"{'cosine_similarity':28}{before:8.3f} s")
+    for normalized in (True, False):
+        similarity = KeywordSimilarity(keywords_embedding, normalized)
+        after, scores = best_time(lambda: similarity.scores(documents),
+                                  args.repeat)
+        assert np.allclose(scores, expected, rtol=0, atol=1e-12)
+        name = "keyword projection" + ("" if normalized else ", norms")
+        print(f"{name:28}{after:8.3f} s ({before / after:.1f}x)")
@@ -0,0 +1,94 @@
+"""
+Benchmark the output encodings of XMLExtractor.
+
+Converted issues are written with every encoding, and read back with
+KrantenFile, to compare the cost of writing with the size of the files and
+the cost of reading them downstream.
+"""
+from argparse import ArgumentParser
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from dataQuest.filter.delpher_kranten import KrantenFile
+from dataQuest.preprocessor.parser import XMLExtractor
+
+
+def parse_arguments():
+    parser = ArgumentParser(
+        prog="benchmark_output_encoding.py",
+        description="Benchmark writing and reading converted issues.")
+    parser.add_argument("--input_dir", default="../example/data",
+                        help="Directory with converted .json.gz files.")
+    parser.add_argument("--glob", default="*.json.gz")
+    parser.add_argument("--threads", type=int, default=4,
+                        help="Threads of the multithreaded encoding.")
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def encodings(threads):
+    yield "indent=4, level 9", dict(compact=False, compresslevel=9)
+    for level in (9, 6, 1):
+        yield f"compact, level {level}", dict(compact=True,
+                                              compresslevel=level)
+    yield (f"compact, level 6, {threads} threads",
+           dict(compact=True, compresslevel=6, threads=threads))
+
+
+def write_issues(issues, output_dir, options):
+    paths = []
+    for i, issue in enumerate(issues):
+        path = os.path.join(output_dir, f"issue_{i}.json.gz")
+        XMLExtractor.save_as_json_compressed(issue, path, **options)
+        paths.append(path)
+    return paths
+
+
+def read_issues(paths, full):
+    for path in paths:
+        document = KrantenFile(Path(path)).read_doc()
+        if full:
+            for article in document.articles:
+                article.text  # pylint: disable=pointless-statement
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    logging.disable(logging.WARNING)
+    issues = []
+    for path in sorted(Path(args.input_dir).rglob(args.glob)):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            issues.append(json.load(f))
+    if not issues:
+        raise SystemExit(f"No input files in {args.input_dir}")
+
+    print(f"{len(issues)} issues; times are per issue")
+    print(f"{'encoding':34}{'size':>10}{'write':>10}{'metadata':>10}"
+          f"{'full read':>10}")
+    for name, options in encodings(args.threads):
+        with tempfile.TemporaryDirectory() as output_dir:
+            write = best_time(
+                lambda: write_issues(issues, output_dir, options),
+                args.repeat)
+            paths = write_issues(issues, output_dir, options)
+            size = sum(os.path.getsize(path) for path in paths)
+            metadata = best_time(lambda: read_issues(paths, False),
+                                 args.repeat)
+            full = best_time(lambda: read_issues(paths, True), args.repeat)
+        n = len(issues)
+        print(f"{name:34}{size / n / 1024:8.1f}kB{write / n * 1e3:8.1f}ms"
+              f"{metadata / n * 1e3:8.2f}ms{full / n * 1e3:8.1f}ms")
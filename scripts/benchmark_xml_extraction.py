@@ -0,0 +1,122 @@
+"""
+Benchmark the extraction of articles and metadata from Delpher XML.
+
+The previous extraction, which decodes every article to a string and walks
+the tree once per field, is compared to XMLExtractor on synthetic XML.
+"""
+from argparse import ArgumentParser
+import logging
+import random
+import time
+import xml.etree.ElementTree as ET
+
+from dataQuest.preprocessor.parser import (XMLExtractor, ETREE_BACKEND,
+                                           LXML_BACKEND, lxml_etree)
+
+WORDS = ["de", "het", "een", "regering", "koning", "Amsterdam", "stad",
+         "nieuws", "zee", "schip", "&amp;", "&lt;", "ë"]
+
+METADATA = """<?xml version="1.0" encoding="UTF-8"?>
+<didl:DIDL xmlns:didl="urn:mpeg:mpeg21:2002:02-DIDL-NS"
+    xmlns:dc="http://purl.org/dc/elements/1.1/"
+    xmlns:dcterms="http://purl.org/dc/terms/"
+    xmlns:dcx="http://krait.kb.nl/coop/tel/handbook/telvocab.xml">
+<didl:Item><didl:Descriptor><didl:Statement>{items}
+<dc:title>Krant</dc:title><dc:language>nl</dc:language>
+<dcx:issuenumber>1</dcx:issuenumber><dc:date>1890-01-01</dc:date>
+<dc:identifier>id</dc:identifier><dcterms:temporal>Dag</dcterms:temporal>
+<dcx:recordRights>rights</dcx:recordRights><dc:publisher>Pub</dc:publisher>
+<dcterms:spatial>Amsterdam</dcterms:spatial>
+<dcterms:spatial>Nederland</dcterms:spatial>
+<dc:source>src</dc:source><dcx:recordIdentifier>rec</dcx:recordIdentifier>
+<dc:type>krant</dc:type><dcterms:isPartOf>part</dcterms:isPartOf>
+</didl:Statement></didl:Descriptor></didl:Item></didl:DIDL>"""
+
+
+def make_article(rng):
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(WORDS)
+                         for _ in range(rng.randint(5, 80))) + "</p>"
+        for _ in range(rng.randint(1, 12)))
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<text><title>Titel'
+            f'</title>{paragraphs}</text>').encode("utf-8")
+
+
+def make_metadata(rng, articles):
+    # A DIDL file lists a resource for every article of the issue.
+    items = "".join(f'<didl:Item><didl:Resource ref="{i}" '
+                    f'mimeType="text/xml"/></didl:Item>'
+                    for i in range(articles))
+    return METADATA.format(items=items).encode("utf-8")
+
+
+def reference_article(content):
+    root = ET.fromstring(content.decode("utf-8", "ignore"))
+    titles = [e.text for e in root.iter() if e.tag.endswith("title")]
+    body = [e.text for e in root.iter() if e.tag.endswith("p")]
+    return {"title": titles[0] if titles and titles[0] is not None else "",
+            "body": body}
+
+
+def reference_metadata(fields, content):
+    root = ET.fromstring(content.decode("utf-8"))
+    metadata = {}
+    for field in fields:
+        values = [e.text for e in root.iter() if e.tag.endswith(field)]
+        values = [value for value in values if value is not None]
+        metadata[field] = (None if not values else values[0]
+                           if field != "spatial" else ", ".join(values))
+    return metadata
+
+
+def measure(function, inputs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [function(data) for data in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs), results
+
+
+def parse_arguments():
+    parser = ArgumentParser(
+        prog="benchmark_xml_extraction.py",
+        description="Benchmark the extraction of articles and metadata.")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--issues", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    logging.disable(logging.WARNING)
+    rng = random.Random(args.seed)
+    articles = [make_article(rng) for _ in range(args.articles)]
+    issues = [make_metadata(rng, rng.randint(10, 200))
+              for _ in range(args.issues)]
+
+    backends = [ETREE_BACKEND] + ([LXML_BACKEND] if lxml_etree else [])
+    reference = XMLExtractor("", "")
+
+    before, expected = measure(reference_article, articles, args.repeat)
+    print(f"article   before     {before * 1e6:9.1f} us")
+    for backend in backends:
+        after, results = measure(
+            lambda data: XMLExtractor.extract_article(data, "", backend),
+            articles, args.repeat)
+        assert results == expected, f"{backend} articles differ"
+        print(f"article   {backend:10} {after * 1e6:9.1f} us "
+              f"({before / after:.1f}x)")
+
+    before, expected = measure(
+        lambda data: reference_metadata(reference.fields, data), issues,
+        args.repeat)
+    print(f"metadata  before     {before * 1e6:9.1f} us")
+    for backend in backends:
+        extractor = XMLExtractor("", "", xml_backend=backend)
+        after, results = measure(extractor.extract_meta, issues, args.repeat)
+        assert results == expected, f"{backend} metadata differ"
+        print(f"metadata  {backend:10} {after * 1e6:9.1f} us "
+              f"({before / after:.1f}x)")
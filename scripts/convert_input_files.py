@@ -1,4 +1,4 @@
-from dataQuest.preprocessor.parser import XMLExtractor
+from dataQuest.preprocessor.parser import XMLExtractor, XML_BACKENDS
 from argparse import ArgumentParser
 from pathlib import Path
 import logging
@@ -14,9 +14,30 @@ def parse_arguments():
         description="Convert nested gzip files to compressed json")
     parser.add_argument("--input_dir", required=True)
     parser.add_argument("--output_dir", required=True)
+    parser.add_argument("--indexed", action="store_true",
+                        help="Write one gzip block per article and an index, "
+                             "for reading single articles.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes converting .tgz files.")
+    parser.add_argument("--xml_backend", default="etree", choices=XML_BACKENDS,
+                        help="Parse XML with xml.etree or with lxml, which "
+                             "must be installed.")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write JSON without indentation.")
+    parser.add_argument("--compresslevel", type=int, default=9,
+                        choices=range(1, 10),
+                        help="Gzip compression level, from 1 (fastest) to "
+                             "9 (smallest).")
+    parser.add_argument("--compress_threads", type=int, default=1,
+                        help="Number of threads compressing an output file.")
     return parser.parse_args()
 
 if __name__=="__main__":
     args = parse_arguments()
-    extractor = XMLExtractor(Path(args.input_dir), Path(args.output_dir))
+    extractor = XMLExtractor(Path(args.input_dir), Path(args.output_dir),
+                             indexed=args.indexed, workers=args.workers,
+                             xml_backend=args.xml_backend,
+                             compact=args.compact,
+                             compresslevel=args.compresslevel,
+                             compress_threads=args.compress_threads)
     extractor.extract_xml_string()